@@ -19,3 +19,6 @@ class DebatesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "debates"
     verbose_name = "Debate Management"
+
+    def ready(self):
+        from . import signals  # noqa: F401
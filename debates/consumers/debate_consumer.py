@@ -99,6 +99,11 @@ class DebateConsumer(
                 }
             )
 
+            # Send the current phase status so the client need not poll it
+            await self.send_json(
+                {"type": "session_status", **await self.get_session_status()}
+            )
+
             # Notify others that user joined
             logger.info(f"Notifying room that {user.username} joined")
             await self.channel_layer.group_send(
@@ -239,7 +244,8 @@ class DebateConsumer(
         """
         Handle moderation action broadcasts.
 
-        Broadcasts moderation actions (mute, warn, kick) to all participants.
+        Broadcasts moderation actions (mute, warn, kick) to all participants
+        as a delta for the moderated user.
 
         Args:
             event: Event data containing moderation action details.
@@ -248,18 +254,33 @@ class DebateConsumer(
             f"Broadcasting moderation action: {event['action']} "
             f"on {event['target_username']}"
         )
-        await self.send_json(
-            {
-                "type": "moderation_action",
-                "action": event["action"],
-                "target_user_id": event["target_user_id"],
-                "target_username": event["target_username"],
-                "moderator": event["moderator"],
-                "reason": event.get("reason", ""),
-                "warnings_count": event.get("warnings_count", 0),
-                "participants": event["participants"],
-            }
-        )
+        message = {
+            "type": "moderation_action",
+            "action": event["action"],
+            "target_user_id": event["target_user_id"],
+            "target_username": event["target_username"],
+            "moderator": event["moderator"],
+            "reason": event.get("reason", ""),
+        }
+        # Only the target's changed fields are sent; clients apply them to
+        # their participant list (a "remove" drops the target from it)
+        for field in ("is_muted", "warnings_count"):
+            if field in event:
+                message[field] = event[field]
+        await self.send_json(message)
+
+    async def moderation_action_batch(self, event):
+        """
+        Handle moderation actions coalesced by the WebSocket batcher.
+
+        Each queued action is delivered to the client as its own
+        moderation_action message, in the order it was queued.
+
+        Args:
+            event: Event data whose "events" are moderation action events.
+        """
+        for action_event in event["events"]:
+            await self.moderation_action(action_event)
 
     async def participant_update(self, event):
         """
@@ -298,9 +319,17 @@ class DebateConsumer(
                 "winner": event.get("winner"),
                 "total_votes": event.get("total_votes"),
                 "reason": event.get("reason"),  # For cancellation
+                "status": event.get("status"),
             }
         )
 
+    @database_sync_to_async
+    def get_session_status(self):
+        """Current phase status of this session, usually from the cache."""
+        from ..services.session_status import get_session_status
+
+        return get_session_status(self.debate_id)
+
     @database_sync_to_async
     def get_debate_session(self, debate_id):
         """
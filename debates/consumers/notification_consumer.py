@@ -8,6 +8,7 @@ import logging
 from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
 
+from ..services.notification_service import NOTIFICATION_BROADCAST_GROUP
 from .base import BaseConsumerMixin
 
 logger = logging.getLogger(__name__)
@@ -25,8 +26,11 @@ class NotificationConsumer(BaseConsumerMixin, AsyncWebsocketConsumer):
         self.user = user
         self.user_group = f"notifications_{user.id}"
 
-        # Join user's personal notification group
+        # Join user's personal notification group and the shared broadcast group
         await self.channel_layer.group_add(self.user_group, self.channel_name)
+        await self.channel_layer.group_add(
+            NOTIFICATION_BROADCAST_GROUP, self.channel_name
+        )
 
         await self.accept()
 
@@ -37,6 +41,9 @@ class NotificationConsumer(BaseConsumerMixin, AsyncWebsocketConsumer):
     async def disconnect(self, close_code):
         if hasattr(self, "user_group"):
             await self.channel_layer.group_discard(self.user_group, self.channel_name)
+            await self.channel_layer.group_discard(
+                NOTIFICATION_BROADCAST_GROUP, self.channel_name
+            )
 
     async def receive(self, text_data):
         # Handle incoming messages (like marking notifications as read)
@@ -56,14 +63,33 @@ class NotificationConsumer(BaseConsumerMixin, AsyncWebsocketConsumer):
 
     async def notification_received(self, event):
         """Handle new notification received"""
-        await self.send_json(
-            {"type": "new_notification", "notification": event["notification"]}
-        )
+        if "raw" in event:
+            # Frame already JSON-encoded by the notification service
+            await self.send(text_data=event["raw"])
+        else:
+            await self.send_json(
+                {"type": "new_notification", "notification": event["notification"]}
+            )
 
         # Send updated unread count
         unread_count = await self.get_unread_count()
         await self.send_json({"type": "unread_count", "count": unread_count})
 
+    async def notification_broadcast(self, event):
+        """Handle a fan-out notification, delivering it only to its recipients"""
+        notification_id = event["recipients"].get(str(self.user.id))
+        if notification_id is None:
+            return
+
+        await self.notification_received(
+            {"raw": f"{event['raw_prefix']}{notification_id}{event['raw_suffix']}"}
+        )
+
+    async def user_vote(self, event):
+        """Handle confirmation that this user's vote was recorded"""
+        # Frame already JSON-encoded by the WebSocket service
+        await self.send(text_data=event["message"])
+
     @database_sync_to_async
     def get_unread_count(self):
         from ..services.notification_service import notification_service
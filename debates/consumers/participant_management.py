@@ -55,10 +55,8 @@ class ParticipantManagementMixin:
         )
 
         logger.info(
-            f"Added participant {
-                self.user.username} to debate {
-                self.debate_id}. Total: {
-                len(participants)}"
+            f"Added participant {self.user.username} to debate "
+            f"{self.debate_id}. Total: {len(participants)}"
         )
 
     @database_sync_to_async
@@ -90,10 +88,8 @@ class ParticipantManagementMixin:
         )
 
         logger.info(
-            f"Removed participant {
-                self.user.username} from debate {
-                self.debate_id}. Remaining: {
-                len(participants)}"
+            f"Removed participant {self.user.username} from debate "
+            f"{self.debate_id}. Remaining: {len(participants)}"
         )
 
     async def get_participants(self):
@@ -133,8 +129,8 @@ class ParticipantManagementMixin:
                     )
             except Exception as e:
                 logger.error(
-                    f"Error getting participation for user {
-                        cached_participant['id']}: {e}"
+                    f"Error getting participation for user "
+                    f"{cached_participant['id']}: {e}"
                 )
                 # Fallback to cached data
                 participants_with_status.append(
@@ -148,11 +144,8 @@ class ParticipantManagementMixin:
                 )
 
         logger.info(
-            f"Retrieved {
-                len(participants_with_status)} participants for debate {
-                self.debate_id}: {
-                [
-                    p['username'] for p in participants_with_status]}"
+            f"Retrieved {len(participants_with_status)} participants for debate "
+            f"{self.debate_id}: {[p['username'] for p in participants_with_status]}"
         )
         return participants_with_status
 
@@ -161,8 +154,10 @@ class ParticipantManagementMixin:
         from ..models.participation import Participation
 
         try:
-            participation = Participation.objects.select_related("user").get(
-                user_id=user_id, session_id=session_id
+            participation = (
+                Participation.objects.select_related("user")
+                .only("is_muted", "warnings_count", "user__username")
+                .get(user_id=user_id, session_id=session_id)
             )
             return {
                 "user_id": participation.user.id,
@@ -182,8 +177,7 @@ class ParticipantManagementMixin:
         # For now, just return the current list
         # In the future, we could add logic to check for stale connections
         logger.info(
-            f"Participant cleanup for debate {
-                self.debate_id}: {
-                len(participants)} active"
+            f"Participant cleanup for debate {self.debate_id}: "
+            f"{len(participants)} active"
         )
         return participants
@@ -0,0 +1,51 @@
+import time
+
+from debates.models import DebateSession
+from debates.services.vote_buffer import flush_votes
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Flush buffered votes of sessions in their voting window every "
+        "VOTE_BUFFER_FLUSH_INTERVAL seconds. Run one instance alongside the "
+        "web workers when VOTE_BUFFER_ENABLED is set."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Flush every voting session once and exit",
+        )
+
+    def handle(self, *args, **options):
+        interval = settings.VOTE_BUFFER_FLUSH_INTERVAL
+
+        if not options["once"]:
+            self.stdout.write(
+                self.style.SUCCESS(f"Flushing buffered votes every {interval}s")
+            )
+
+        while True:
+            started = time.monotonic()
+            self._flush()
+            if options["once"]:
+                return
+
+            # Sleep off the rest of the interval so flushes stay evenly spaced
+            time.sleep(max(0, interval - (time.monotonic() - started)))
+
+    def _flush(self):
+        """Drain the vote buffer of every session in its voting window."""
+        voting_session_ids = DebateSession.objects.filter(status="voting").values_list(
+            "id", flat=True
+        )
+
+        for session_id in voting_session_ids:
+            flushed = flush_votes(session_id)
+            if flushed:
+                self.stdout.write(
+                    f"Flushed {flushed} buffered votes for session {session_id}"
+                )
@@ -0,0 +1,71 @@
+import json
+import select
+
+from debates.models import DebateSession
+from debates.services.websocket_service import broadcast_session_status
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+# Channel the session status trigger (migration 0021) notifies on
+NOTIFY_CHANNEL = "session_status"
+
+# Broadcast event for each status the trigger reports. Cancellations carry
+# the moderator's reason, which the row doesn't hold, so cancel_session
+# keeps broadcasting them itself.
+STATUS_EVENTS = {
+    "open": "joining_window_opened",
+    "closed": "joining_window_closed",
+    "online": "debate_started",
+    "voting": "voting_started",
+    "finished": "session_finished",
+}
+
+POLL_TIMEOUT = 5
+
+
+class Command(BaseCommand):
+    help = (
+        "Broadcast session status changes notified by PostgreSQL. Run one "
+        "instance with DEBATE_SESSION_STATUS_NOTIFY enabled; it needs a direct "
+        "database connection, as LISTEN does not work through transaction pooling."
+    )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("listen_sessions requires PostgreSQL")
+
+        connection.ensure_connection()
+        connection.set_autocommit(True)
+        pg_connection = connection.connection
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+
+        self.stdout.write(self.style.SUCCESS("Listening for session status changes"))
+
+        while True:
+            # Wait for the socket to become readable, then drain notifications
+            if not select.select([pg_connection], [], [], POLL_TIMEOUT)[0]:
+                continue
+
+            pg_connection.poll()
+            while pg_connection.notifies:
+                notify = pg_connection.notifies.pop(0)
+                self._broadcast(json.loads(notify.payload))
+
+    def _broadcast(self, payload):
+        """Send the status change in payload to the session's debate room."""
+        event_type = STATUS_EVENTS.get(payload["status"])
+        if event_type is None:
+            return
+
+        session = (
+            DebateSession.objects.select_related("winner_participant")
+            .filter(pk=payload["id"])
+            .first()
+        )
+        if session is None:
+            return
+
+        broadcast_session_status(session, event_type)
+        self.stdout.write(f"Broadcast {event_type} for session {session.id}")
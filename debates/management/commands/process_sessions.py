@@ -1,8 +1,11 @@
 from datetime import timedelta
 
-from debates.models import DebateSession, Notification
+from debates.models import DebateSession
+from debates.services.vote_buffer import flush_votes
+from django.core.exceptions import ValidationError
 from django.core.management.base import BaseCommand
 from django.utils import timezone
+from notifications.models import Notification
 
 
 class Command(BaseCommand):
@@ -49,9 +52,18 @@ class Command(BaseCommand):
         )
 
         for session in sessions_to_vote:
-            session.status = "closed"
+            # Enters the voting status the expired-voting loop below finishes
+            session.status = "voting"
+            session.voting_started_at = now
             session.voting_end_time = now + timedelta(minutes=10)
-            session.save()
+            session.save(
+                update_fields=[
+                    "status",
+                    "voting_started_at",
+                    "voting_end_time",
+                    "updated_at",
+                ]
+            )
 
             self.stdout.write(
                 self.style.SUCCESS(f"Started voting period for session {session.id}")
@@ -60,16 +72,35 @@ class Command(BaseCommand):
             # Notify participants about voting
             self._notify_voting_started(session)
 
-        # Auto-finish voting and calculate results
-        sessions_to_finish = DebateSession.objects.filter(
-            status="closed", voting_end_time__lte=now
+        # Flush buffered ballots for sessions in their voting window
+        voting_session_ids = DebateSession.objects.filter(status="voting").values_list(
+            "id", flat=True
         )
 
-        for session in sessions_to_finish:
-            session.status = "finished"
-            session.save()
+        for session_id in voting_session_ids:
+            flushed = flush_votes(session_id)
+            if flushed:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"Flushed {flushed} buffered votes for session {session_id}"
+                    )
+                )
+
+        # Finish sessions whose voting window has expired
+        expired_voting_sessions = DebateSession.objects.filter(
+            status="voting", voting_end_time__lte=now
+        )
 
-            self.stdout.write(self.style.SUCCESS(f"Finished session {session.id}"))
+        for session in expired_voting_sessions:
+            try:
+                session.finish_voting()
+            except ValidationError:
+                # Already transitioned by another worker
+                continue
+
+            self.stdout.write(
+                self.style.SUCCESS(f"Finished voting for session {session.id}")
+            )
 
     def _notify_debate_starting(self, session):
         """Notify all registered users about debate starting"""
@@ -77,16 +108,20 @@ class Command(BaseCommand):
 
         User = get_user_model()
 
-        # For now, notify all active users - in production, this would be more targeted
-        users = User.objects.filter(is_active=True)[:50]  # Limit to avoid spam
+        # Notify active users not already in the session; the exclusion and
+        # the limit are applied in SQL rather than on loaded users
+        users = (
+            User.objects.filter(is_active=True)
+            .exclude(id__in=session.participation_set.values("user_id"))
+            .only("id")[:50]  # Limit to avoid spam
+        )
 
         notifications = [
             Notification(
-                recipient=user,
+                user=user,
                 notification_type="debate_starting",
                 title=f"Debate starting: {session.topic.title}",
                 message=f'A debate on "{session.topic.title}" is starting! Join now during the 5-minute joining window.',
-                session=session,
             )
             for user in users
         ]
@@ -99,11 +134,10 @@ class Command(BaseCommand):
 
         notifications = [
             Notification(
-                recipient=participant,
+                user=participant,
                 notification_type="vote_reminder",
                 title="Voting has started!",
                 message=f'The debate on "{session.topic.title}" has ended. You have 10 minutes to vote.',
-                session=session,
             )
             for participant in participants
         ]
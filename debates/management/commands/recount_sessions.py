@@ -0,0 +1,53 @@
+from debates.models import DebateSession, Message, Participation, Vote
+from debates.services.optimized_views import invalidate_session_list_cache
+from django.core.management.base import BaseCommand
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+
+def _count(queryset, session_field, **filters):
+    """Correlated subquery counting the rows of queryset for each session."""
+    counts = (
+        queryset.filter(**{session_field: OuterRef("pk")})
+        .order_by()
+        .values(session_field)
+        .annotate(count=Count("pk", filter=Q(**filters)))
+        .values("count")
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the running participant, viewer, message and vote counts "
+        "stored on debate sessions, whenever they may have drifted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "session_ids",
+            nargs="*",
+            type=int,
+            help="Sessions to recount (default: all sessions)",
+        )
+
+    def handle(self, *args, **options):
+        sessions = DebateSession.objects.all()
+        if options["session_ids"]:
+            sessions = sessions.filter(pk__in=options["session_ids"])
+
+        # One UPDATE, each count a correlated subquery
+        updated = sessions.update(
+            participant_count=_count(
+                Participation.objects, "session", role="participant"
+            ),
+            viewer_count=_count(Participation.objects, "session", role="viewer"),
+            message_count=_count(Message.objects, "session"),
+            **{
+                field: _count(Vote.objects, "debate_session", vote_type=vote_type)
+                for vote_type, field in DebateSession.VOTE_COUNT_FIELDS.items()
+            },
+        )
+        invalidate_session_list_cache()
+
+        self.stdout.write(self.style.SUCCESS(f"Recounted {updated} sessions"))
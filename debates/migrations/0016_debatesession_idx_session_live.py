@@ -0,0 +1,23 @@
+# Generated by Django 4.2.23 on 2026-10-16 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("debates", "0015_fix_message_user_field"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="debatesession",
+            index=models.Index(
+                condition=models.Q(
+                    ("status__in", ["open", "closed", "online", "voting"])
+                ),
+                fields=["status", "joining_window_end"],
+                name="idx_session_live",
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.23 on 2026-10-16 09:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("debates", "0016_debatesession_idx_session_live"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="vote",
+            name="debate_session",
+            field=models.ForeignKey(
+                help_text="The debate session this vote belongs to",
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="votes",
+                to="debates.debatesession",
+            ),
+        ),
+    ]
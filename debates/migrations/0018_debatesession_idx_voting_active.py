@@ -0,0 +1,21 @@
+# Generated by Django 4.2.23 on 2026-10-16 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("debates", "0017_alter_vote_debate_session"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="debatesession",
+            index=models.Index(
+                condition=models.Q(("status", "voting")),
+                fields=["voting_end_time"],
+                name="idx_voting_active",
+            ),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.23 on 2026-10-16 10:40
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_vote_counts(apps, schema_editor):
+    DebateSession = apps.get_model("debates", "DebateSession")
+    Vote = apps.get_model("debates", "Vote")
+
+    def count_of(vote_type):
+        counts = (
+            Vote.objects.filter(debate_session=OuterRef("pk"), vote_type=vote_type)
+            .order_by()
+            .values("debate_session")
+            .annotate(count=Count("id"))
+            .values("count")
+        )
+        return Coalesce(Subquery(counts), 0)
+
+    DebateSession.objects.update(
+        best_argument_vote_count=count_of("BEST_ARGUMENT"),
+        winning_side_vote_count=count_of("WINNING_SIDE"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("debates", "0018_debatesession_idx_voting_active"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="debatesession",
+            name="best_argument_vote_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="debatesession",
+            name="winning_side_vote_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_vote_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.23 on 2026-10-16 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("debates", "0019_debatesession_vote_counts"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="message",
+            index=models.Index(
+                fields=["session", "timestamp"], name="idx_message_session_ts"
+            ),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.23 on 2026-10-16 12:10
+
+from django.db import migrations
+
+CREATE_TRIGGER = """
+CREATE OR REPLACE FUNCTION debates_notify_session_status() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify(
+        'session_status',
+        json_build_object('id', NEW.id, 'status', NEW.status)::text
+    );
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS debates_session_status_notify ON debates_debatesession;
+CREATE TRIGGER debates_session_status_notify
+    AFTER UPDATE OF status ON debates_debatesession
+    FOR EACH ROW
+    WHEN (OLD.status IS DISTINCT FROM NEW.status)
+    EXECUTE FUNCTION debates_notify_session_status();
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER IF EXISTS debates_session_status_notify ON debates_debatesession;
+DROP FUNCTION IF EXISTS debates_notify_session_status();
+"""
+
+
+def create_trigger(apps, schema_editor):
+    # LISTEN/NOTIFY is PostgreSQL only; other backends keep app broadcasts
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(CREATE_TRIGGER)
+
+
+def drop_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(DROP_TRIGGER)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("debates", "0020_message_idx_message_session_ts"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigger, drop_trigger),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.23 on 2026-10-16 12:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("debates", "0021_debatesession_status_notify_trigger"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="participation",
+            index=models.Index(
+                fields=["session", "role", "side"], name="idx_participation_role"
+            ),
+        ),
+    ]
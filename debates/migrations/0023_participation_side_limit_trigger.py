@@ -0,0 +1,61 @@
+# Generated by Django 4.2.23 on 2026-10-16 14:05
+
+from django.db import migrations
+
+CREATE_TRIGGER = """
+CREATE OR REPLACE FUNCTION debates_check_participation_side_limit() RETURNS trigger AS $$
+BEGIN
+    -- Serialize joins per session so concurrent joiners can't both see 9.
+    -- The bigint id is hashed into the int4 key; a collision only makes two
+    -- sessions wait on each other.
+    PERFORM pg_advisory_xact_lock(
+        hashtext('debates_participation_side'), hashtext(NEW.session_id::text)
+    );
+    IF (
+        SELECT count(*) FROM debates_participation
+        WHERE session_id = NEW.session_id
+          AND role = 'participant'
+          AND side = NEW.side
+          AND user_id <> NEW.user_id
+    ) >= 10 THEN
+        RAISE EXCEPTION 'Maximum participants reached for % side', NEW.side
+            USING ERRCODE = 'check_violation';
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS debates_participation_side_limit ON debates_participation;
+CREATE TRIGGER debates_participation_side_limit
+    BEFORE INSERT OR UPDATE OF role, side ON debates_participation
+    FOR EACH ROW
+    WHEN (NEW.role = 'participant')
+    EXECUTE FUNCTION debates_check_participation_side_limit();
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER IF EXISTS debates_participation_side_limit ON debates_participation;
+DROP FUNCTION IF EXISTS debates_check_participation_side_limit();
+"""
+
+
+def create_trigger(apps, schema_editor):
+    # Other backends keep the count check in DebateSessionViewSet.join
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(CREATE_TRIGGER)
+
+
+def drop_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(DROP_TRIGGER)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("debates", "0022_participation_idx_participation_role"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigger, drop_trigger),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 4.2.23 on 2026-10-16 14:40
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_running_counts(apps, schema_editor):
+    DebateSession = apps.get_model("debates", "DebateSession")
+    Message = apps.get_model("debates", "Message")
+    Participation = apps.get_model("debates", "Participation")
+
+    def count_of(model, **filters):
+        counts = (
+            model.objects.filter(session=OuterRef("pk"), **filters)
+            .order_by()
+            .values("session")
+            .annotate(count=Count("id"))
+            .values("count")
+        )
+        return Coalesce(Subquery(counts), 0)
+
+    DebateSession.objects.update(
+        participant_count=count_of(Participation, role="participant"),
+        viewer_count=count_of(Participation, role="viewer"),
+        message_count=count_of(Message),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("debates", "0023_participation_side_limit_trigger"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="debatesession",
+            name="message_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="debatesession",
+            name="participant_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="debatesession",
+            name="viewer_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_running_counts, migrations.RunPython.noop),
+    ]
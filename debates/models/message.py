@@ -72,6 +72,12 @@ class Message(TimestampedMixin):
         ordering = ["timestamp"]
         verbose_name = "Message"
         verbose_name_plural = "Messages"
+        indexes = [
+            # Session message lists are read in timestamp order
+            models.Index(
+                fields=["session", "timestamp"], name="idx_message_session_ts"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.username}: {self.content[:50]}"
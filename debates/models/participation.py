@@ -57,6 +57,12 @@ class Participation(TimestampedMixin):
         unique_together = ("user", "session")
         verbose_name = "Participation"
         verbose_name_plural = "Participations"
+        indexes = [
+            # Session participants are filtered and counted by role and side
+            models.Index(
+                fields=["session", "role", "side"], name="idx_participation_role"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.role} in {self.session}"
@@ -10,11 +10,14 @@ from datetime import timedelta
 
 from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import connection, models, transaction
+from django.db.models import Count, F, Q
 from django.utils import timezone
 
 from .base import StatusMixin, TimestampedMixin
+from .participation import Participation
 from .topic import DebateTopic
+from .vote import Vote
 
 
 class DebateSession(TimestampedMixin, StatusMixin):
@@ -88,6 +91,17 @@ class DebateSession(TimestampedMixin, StatusMixin):
     )
     total_votes = models.IntegerField(default=0)
 
+    # Running vote counts per vote type, kept current as ballots are cast so
+    # live vote broadcasts do not have to count the votes table
+    best_argument_vote_count = models.PositiveIntegerField(default=0)
+    winning_side_vote_count = models.PositiveIntegerField(default=0)
+
+    # Running participation and message counts, kept current by the signal
+    # handlers so status polls and session lists read them off the row
+    participant_count = models.PositiveIntegerField(default=0)
+    viewer_count = models.PositiveIntegerField(default=0)
+    message_count = models.PositiveIntegerField(default=0)
+
     participants = models.ManyToManyField(
         settings.AUTH_USER_MODEL,
         related_name="debate_sessions",
@@ -102,6 +116,21 @@ class DebateSession(TimestampedMixin, StatusMixin):
         ordering = ["-created_at"]
         verbose_name = "Debate Session"
         verbose_name_plural = "Debate Sessions"
+        indexes = [
+            # Partial index: only live sessions are indexed, so scheduler
+            # polls scale with active sessions rather than the whole table
+            models.Index(
+                fields=["status", "joining_window_end"],
+                name="idx_session_live",
+                condition=models.Q(status__in=["open", "closed", "online", "voting"]),
+            ),
+            # Scheduler lookup of sessions whose voting window has expired
+            models.Index(
+                fields=["voting_end_time"],
+                name="idx_voting_active",
+                condition=models.Q(status="voting"),
+            ),
+        ]
 
     def clean(self):
         """
@@ -115,6 +144,52 @@ class DebateSession(TimestampedMixin, StatusMixin):
         if self.duration_minutes > 180:
             raise ValidationError("Duration cannot exceed 180 minutes")
 
+    VOTE_COUNT_FIELDS = {
+        "BEST_ARGUMENT": "best_argument_vote_count",
+        "WINNING_SIDE": "winning_side_vote_count",
+    }
+
+    def record_vote(self, vote_type):
+        """
+        Add a newly cast vote to the running vote counts.
+
+        The counter is incremented atomically in the database and the counts
+        on this instance are refreshed from the updated row.
+        """
+        field = self.VOTE_COUNT_FIELDS[vote_type]
+        type(self).objects.filter(pk=self.pk).update(**{field: F(field) + 1})
+        self.refresh_from_db(fields=list(self.VOTE_COUNT_FIELDS.values()))
+
+    @classmethod
+    def recount_votes(cls, session_id):
+        """
+        Recompute a session's running vote counts from its stored votes.
+
+        Used after writes that bypass record_vote(), such as batched inserts
+        of buffered ballots.
+        """
+        counts = Vote.objects.filter(debate_session_id=session_id).aggregate(
+            **{
+                field: Count("id", filter=Q(vote_type=vote_type))
+                for vote_type, field in cls.VOTE_COUNT_FIELDS.items()
+            }
+        )
+        cls.objects.filter(pk=session_id).update(**counts)
+
+    @classmethod
+    def recount_participants(cls, session_id):
+        """
+        Recompute a session's participant and viewer counts.
+
+        Called whenever a participation is added, removed or changes role,
+        including writes that skip the model signals such as the join upsert.
+        """
+        counts = Participation.objects.filter(session_id=session_id).aggregate(
+            participant_count=Count("pk", filter=Q(role="participant")),
+            viewer_count=Count("pk", filter=Q(role="viewer")),
+        )
+        cls.objects.filter(pk=session_id).update(**counts)
+
     @property
     def is_voting_active(self):
         """
@@ -154,92 +229,150 @@ class DebateSession(TimestampedMixin, StatusMixin):
         """Count of viewers in the session"""
         return self.participation_set.filter(role="viewer").count()
 
+    def _lock_for_transition(self, allowed_statuses, error_message):
+        """
+        Lock this session's row and re-check its status before a transition.
+
+        Must be called inside ``transaction.atomic()``. On backends that
+        support it the lock uses ``SKIP LOCKED`` so a concurrent transition
+        (double-clicking moderator, scheduler retry) fails fast instead of
+        queueing behind the first one.
+
+        Raises:
+            ValidationError: If another transition holds the lock or the
+                stored status is not one of ``allowed_statuses``.
+        """
+        try:
+            current = (
+                type(self)
+                .objects.select_for_update(
+                    skip_locked=connection.features.has_select_for_update_skip_locked
+                )
+                .only("status")
+                .get(pk=self.pk)
+            )
+        except type(self).DoesNotExist:
+            raise ValidationError("Session is already being transitioned")
+
+        if current.status not in allowed_statuses:
+            raise ValidationError(error_message)
+
     def start_joining_window(self):
         """Start the 5-minute joining window"""
-        if self.status != "offline":
-            raise ValidationError("Can only start joining window from offline status")
-
-        now = timezone.now()
-        self.status = "open"
-        self.joining_started_at = now
-        self.joining_window_end = now + timedelta(minutes=5)
-        self.save()
+        with transaction.atomic():
+            self._lock_for_transition(
+                ["offline"], "Can only start joining window from offline status"
+            )
+
+            now = timezone.now()
+            self.status = "open"
+            self.joining_started_at = now
+            self.joining_window_end = now + timedelta(minutes=5)
+            self.save(
+                update_fields=[
+                    "status",
+                    "joining_started_at",
+                    "joining_window_end",
+                    "updated_at",
+                ]
+            )
 
     def close_joining_window(self):
         """Close joining window and allow only viewers"""
-        if self.status != "open":
-            raise ValidationError("Can only close from open status")
+        with transaction.atomic():
+            self._lock_for_transition(["open"], "Can only close from open status")
 
-        self.status = "closed"
-        self.save()
+            self.status = "closed"
+            self.save(update_fields=["status", "updated_at"])
 
-        # Convert late joiners to viewers
-        self.participation_set.filter(joined_at__gt=self.joining_window_end).update(
-            role="viewer"
-        )
+            # Convert late joiners to viewers
+            self.participation_set.filter(joined_at__gt=self.joining_window_end).update(
+                role="viewer"
+            )
+            type(self).recount_participants(self.pk)
 
     def start_debate(self):
         """Start the actual debate (unlock chat for participants)"""
-        if self.status not in ["open", "closed"]:
-            raise ValidationError("Can only start debate from open or closed status")
-
-        now = timezone.now()
-        self.status = "online"
-        self.debate_started_at = now
-        self.debate_end_time = now + timedelta(minutes=self.duration_minutes)
-        self.save()
+        with transaction.atomic():
+            self._lock_for_transition(
+                ["open", "closed"], "Can only start debate from open or closed status"
+            )
+
+            now = timezone.now()
+            self.status = "online"
+            self.debate_started_at = now
+            self.debate_end_time = now + timedelta(minutes=self.duration_minutes)
+            self.save(
+                update_fields=[
+                    "status",
+                    "debate_started_at",
+                    "debate_end_time",
+                    "updated_at",
+                ]
+            )
 
     def end_debate_and_start_voting(self):
         """End debate and start 30-second voting period"""
-        if self.status != "online":
-            raise ValidationError("Can only end debate from online status")
-
-        now = timezone.now()
-        self.status = "voting"
-        self.voting_started_at = now
-        self.voting_end_time = now + timedelta(seconds=30)
-        self.save()
+        with transaction.atomic():
+            self._lock_for_transition(
+                ["online"], "Can only end debate from online status"
+            )
+
+            now = timezone.now()
+            self.status = "voting"
+            self.voting_started_at = now
+            self.voting_end_time = now + timedelta(seconds=30)
+            self.save(
+                update_fields=[
+                    "status",
+                    "voting_started_at",
+                    "voting_end_time",
+                    "updated_at",
+                ]
+            )
 
     def finish_voting(self):
         """End voting and calculate side-based results"""
-        if self.status != "voting":
-            raise ValidationError("Can only finish from voting status")
-
-        # Calculate side-based winner
-        from django.db.models import Count
-
-        votes = (
-            self.votes.values("vote")
-            .annotate(vote_count=Count("vote"))
-            .order_by("-vote_count")
-        )
-
-        proposition_votes = 0
-        opposition_votes = 0
-
-        for vote_data in votes:
-            if vote_data["vote"] == "proposition":
-                proposition_votes = vote_data["vote_count"]
-            elif vote_data["vote"] == "opposition":
-                opposition_votes = vote_data["vote_count"]
-
-        # Determine winner
-        if proposition_votes > opposition_votes:
-            # Find a proposition participant to declare winner
-            winner_participation = self.participation_set.filter(
-                role="participant", side="proposition"
-            ).first()
-            if winner_participation:
-                self.winner_participant = winner_participation.user
-        elif opposition_votes > proposition_votes:
-            # Find an opposition participant to declare winner
-            winner_participation = self.participation_set.filter(
-                role="participant", side="opposition"
-            ).first()
-            if winner_participation:
-                self.winner_participant = winner_participation.user
-        # If tie, winner_participant remains None
-
-        self.total_votes = proposition_votes + opposition_votes
-        self.status = "finished"
-        self.save()
+        with transaction.atomic():
+            self._lock_for_transition(["voting"], "Can only finish from voting status")
+
+            # Persist any ballots still sitting in the vote buffer
+            from ..services.vote_buffer import flush_votes
+
+            flush_votes(self.pk)
+
+            # Tally both sides in one query
+            tally = self.votes.aggregate(
+                proposition=Count("pk", filter=Q(vote_type="proposition")),
+                opposition=Count("pk", filter=Q(vote_type="opposition")),
+            )
+            proposition_votes = tally["proposition"]
+            opposition_votes = tally["opposition"]
+
+            # Determine winner
+            if proposition_votes > opposition_votes:
+                # Find a proposition participant to declare winner
+                winner_participation = self.participation_set.filter(
+                    role="participant", side="proposition"
+                ).first()
+                if winner_participation:
+                    self.winner_participant = winner_participation.user
+            elif opposition_votes > proposition_votes:
+                # Find an opposition participant to declare winner
+                winner_participation = self.participation_set.filter(
+                    role="participant", side="opposition"
+                ).first()
+                if winner_participation:
+                    self.winner_participant = winner_participation.user
+            # If tie, winner_participant remains None
+
+            self.total_votes = proposition_votes + opposition_votes
+            self.status = "finished"
+            self.save(
+                update_fields=[
+                    "status",
+                    "winner_participant",
+                    "total_votes",
+                    "updated_at",
+                ]
+            )
@@ -34,7 +34,9 @@ class Vote(models.Model):
     debate_session = models.ForeignKey(
         "DebateSession",
         related_name="votes",
-        on_delete=models.CASCADE,
+        # Cleaned up in bulk by the DebateSession pre_delete handler in
+        # debates.signals, which also runs for cascades and queryset deletes
+        on_delete=models.DO_NOTHING,
         help_text="The debate session this vote belongs to",
     )
     user = models.ForeignKey(
@@ -66,10 +68,7 @@ class Vote(models.Model):
     def clean(self):
         """Validate vote constraints"""
         super().clean()
-
-        # Only students can vote
-        if hasattr(self.user, "role") and self.user.role != "student":
-            raise ValidationError("Only students can vote")
+        self._check_voter_role()
 
         # Check if user already voted
         if self.pk is None:  # Only for new votes
@@ -79,8 +78,15 @@ class Vote(models.Model):
             if existing_vote:
                 raise ValidationError("User has already voted in this session")
 
+    def _check_voter_role(self):
+        # Only students can vote
+        if hasattr(self.user, "role") and self.user.role != "student":
+            raise ValidationError("Only students can vote")
+
     def save(self, *args, **kwargs):
-        self.clean()
+        # A second ballot is rejected by the (debate_session, user) unique
+        # constraint on INSERT, so the lookup done in clean() is skipped here
+        self._check_voter_role()
         super().save(*args, **kwargs)
 
 
@@ -19,6 +19,13 @@ from .models import (
     Vote,  # Add new Vote model
 )
 
+# Shared list serializer for the session participant/viewer fields, so the
+# user fields are built once instead of once per session and per field
+_USER_LIST_SERIALIZER = UserSerializer(many=True)
+
+# Most recent messages nested in a session detail
+SESSION_MESSAGE_LIMIT = 20
+
 
 class MessageSerializer(serializers.ModelSerializer):
     """Serializer for debate messages."""
@@ -73,7 +80,7 @@ class DebateSessionSerializer(serializers.ModelSerializer):
     participants = ParticipationSerializer(
         source="participation_set", many=True, read_only=True
     )
-    messages = MessageSerializer(many=True, read_only=True)
+    messages = serializers.SerializerMethodField()
     winner_participant = UserSerializer(read_only=True)
 
     # Computed fields
@@ -131,15 +138,36 @@ class DebateSessionSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
 
+    def _participations(self, obj, role):
+        # Prefer the role-partitioned prefetches from the viewset queryset,
+        # falling back to filtering participation_set for unprefetched instances
+        to_attr = {
+            "participant": "active_participations",
+            "viewer": "viewer_participations",
+        }[role]
+        if hasattr(obj, to_attr):
+            return getattr(obj, to_attr)
+        return [p for p in obj.participation_set.all() if p.role == role]
+
+    def get_messages(self, obj):
+        """Return the session's most recent messages, newest first."""
+        # Prefer the sliced prefetch from the viewset queryset
+        messages = getattr(obj, "recent_messages", None)
+        if messages is None:
+            messages = obj.messages.select_related("user").order_by("-timestamp")[
+                :SESSION_MESSAGE_LIMIT
+            ]
+        return MessageSerializer(messages, many=True, context=self.context).data
+
     def get_active_participants(self, obj):
         """Return users who are active participants (not viewers)."""
-        participants = obj.participation_set.filter(role="participant")
-        return UserSerializer([p.user for p in participants], many=True).data
+        participants = self._participations(obj, "participant")
+        return _USER_LIST_SERIALIZER.to_representation([p.user for p in participants])
 
     def get_viewers(self, obj):
         """Return users who are viewers (not participants)."""
-        viewers = obj.participation_set.filter(role="viewer")
-        return UserSerializer([v.user for v in viewers], many=True).data
+        viewers = self._participations(obj, "viewer")
+        return _USER_LIST_SERIALIZER.to_representation([v.user for v in viewers])
 
     def get_can_join_as_participant(self, obj):
         return obj.can_join_as_participant
@@ -151,13 +179,50 @@ class DebateSessionSerializer(serializers.ModelSerializer):
         return obj.is_voting_active
 
     def get_participant_count(self, obj):
-        return obj.participation_set.filter(role="participant").count()
+        count = getattr(obj, "participant_count", None)
+        if count is None:
+            count = len(self._participations(obj, "participant"))
+        return count
 
     def get_viewer_count(self, obj):
-        return obj.participation_set.filter(role="viewer").count()
+        count = getattr(obj, "viewer_count", None)
+        if count is None:
+            count = len(self._participations(obj, "viewer"))
+        return count
 
     def get_has_active_participants(self, obj):
-        return obj.has_active_participants
+        if hasattr(obj, "active_participations"):
+            return any(p.user.is_active for p in obj.active_participations)
+        # Without the prefetch, one EXISTS query beats loading every user
+        return obj.participation_set.filter(
+            role="participant", user__is_active=True
+        ).exists()
+
+
+class DebateSessionListSerializer(DebateSessionSerializer):
+    """Slim session serializer for list views, without nested messages or participations."""
+
+    class Meta(DebateSessionSerializer.Meta):
+        fields = [
+            "id",
+            "topic",
+            "moderator",
+            "scheduled_start",
+            "duration_minutes",
+            "status",
+            "joining_window_end",
+            "debate_end_time",
+            "voting_end_time",
+            "total_votes",
+            "created_at",
+            "updated_at",
+            "can_join_as_participant",
+            "can_join_as_viewer",
+            "is_voting_active",
+            "participant_count",
+            "viewer_count",
+            "has_active_participants",
+        ]
 
 
 class ModerationActionSerializer(serializers.ModelSerializer):
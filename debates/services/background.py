@@ -0,0 +1,60 @@
+"""
+Background execution of request side effects.
+
+Session lifecycle actions notify users and broadcast the new session state
+after changing it. Neither affects the response, so they run on a small
+thread pool once the transaction that changed the session commits, rather
+than holding up the moderator's request.
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+logger = logging.getLogger(__name__)
+
+MAX_WORKERS = 4
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def run_in_background(func, *args, **kwargs):
+    """
+    Call func(*args, **kwargs) on the background pool after the current commit.
+
+    With DEBATE_BACKGROUND_TASKS_EAGER set the call runs inline instead, so
+    tests see its effects (and its errors) immediately.
+    """
+    if settings.DEBATE_BACKGROUND_TASKS_EAGER:
+        func(*args, **kwargs)
+        return
+
+    transaction.on_commit(lambda: _get_executor().submit(_run, func, args, kwargs))
+
+
+def _get_executor():
+    """Create the shared thread pool on first use."""
+    global _executor
+
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=MAX_WORKERS, thread_name_prefix="debate-bg"
+                )
+    return _executor
+
+
+def _run(func, args, kwargs):
+    """Run one job, logging its failure and tidying the thread's DB connection."""
+    close_old_connections()
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        logger.exception(f"Background task {func.__qualname__} failed")
+    finally:
+        close_old_connections()
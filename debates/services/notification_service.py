@@ -6,6 +6,8 @@ for the bell icon interface. Provides comprehensive notification management
 including delivery, tracking, and cleanup operations.
 """
 
+import asyncio
+import json
 import logging
 from datetime import timedelta
 from typing import Any, Dict, List, Optional
@@ -13,12 +15,51 @@ from typing import Any, Dict, List, Optional
 from asgiref.sync import async_to_sync
 from channels.layers import get_channel_layer
 from django.contrib.auth import get_user_model
-from django.db import models
 from django.utils import timezone
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
+# Channel layer group every connected notification socket is subscribed to
+NOTIFICATION_BROADCAST_GROUP = "debate_broadcast"
+
+# (title, message) templates per session notification type, formatted with
+# the session's topic title and any type-specific values
+_NOTIF_TEMPLATES = {
+    "session_starting": (
+        "🔥 New Debate Starting: {title}",
+        'A new debate on "{title}" is starting! Join now during the 5-minute joining window.',
+    ),
+    "joining_opened": (
+        "Debate starting: {title}",
+        "The joining window is now open! You have 5 minutes to join as a participant.",
+    ),
+    "joining_closing": (
+        "Last chance to join: {title}",
+        "Joining window closes in 1 minute! Join now as a participant.",
+    ),
+    "debate_started": (
+        "💬 Debate Chat Unlocked!",
+        'The debate on "{title}" has started. Participants can now chat!',
+    ),
+    "voting_started": (
+        "🗳️ Voting Started!",
+        'The debate on "{title}" has ended. Vote for the best participant now! (30 seconds)',
+    ),
+    "session_finished": (
+        "Debate finished: {title}",
+        "The debate has concluded with {total_votes} votes.{winner_text}",
+    ),
+}
+
+# Messages sent to the target user of a moderation action
+_MOD_ACTION_TEMPLATES = {
+    "mute": 'You have been muted in "{title}"',
+    "unmute": 'You have been unmuted in "{title}"',
+    "warn": 'You received a warning in "{title}"',
+    "kick": 'You have been removed from "{title}"',
+}
+
 
 class NotificationService:
     """
@@ -48,6 +89,7 @@ class NotificationService:
         action_label=None,
         expires_in_minutes=None,
         delivery_method="websocket",
+        fan_out=False,
     ):
         """
         Send notifications to multiple recipients.
@@ -64,6 +106,8 @@ class NotificationService:
             action_label: Label for notification action button (optional).
             expires_in_minutes: Notification expiration time in minutes (optional).
             delivery_method: Delivery method ('websocket', 'email', 'both').
+            fan_out: Publish one message to the broadcast group instead of one
+                per recipient; consumers keep only the entries addressed to them.
 
         Returns:
             List of created Notification objects.
@@ -71,53 +115,67 @@ class NotificationService:
         # Import here to avoid circular imports
         from notifications.models import Notification
 
-        notifications = []
+        # One clock read for the whole batch
+        now = timezone.now()
         expires_at = None
 
         if expires_in_minutes:
-            expires_at = timezone.now() + timedelta(minutes=expires_in_minutes)
+            expires_at = now + timedelta(minutes=expires_in_minutes)
 
+        # Drop repeated recipients by id, keeping the first occurrence
+        seen_ids = set()
+        unique_recipients = []
         for recipient in recipients:
-            # Create notification record
-            notification = Notification.objects.create(
-                recipient=recipient,
-                sender=sender,
-                notification_type=notification_type,
-                priority=priority,
-                title=title,
-                message=message,
-                session=session,
-                action_url=action_url,
-                action_label=action_label,
-                expires_at=expires_at,
-                delivery_method=delivery_method,
-            )
-            notifications.append(notification)
+            if recipient.id not in seen_ids:
+                seen_ids.add(recipient.id)
+                unique_recipients.append(recipient)
+
+        # Create all notification records in a single INSERT
+        notifications = Notification.objects.bulk_create(
+            [
+                Notification(
+                    recipient=recipient,
+                    sender=sender,
+                    notification_type=notification_type,
+                    priority=priority,
+                    title=title,
+                    message=message,
+                    session=session,
+                    action_url=action_url,
+                    action_label=action_label,
+                    timestamp=now,
+                    expires_at=expires_at,
+                    delivery_method=delivery_method,
+                )
+                for recipient in unique_recipients
+            ]
+        )
 
-            # Send via WebSocket if requested
-            if delivery_method in ["websocket", "both"]:
-                self._send_websocket_notification(notification)
+        # Send via WebSocket if requested
+        if delivery_method in ["websocket", "both"]:
+            if fan_out:
+                self._broadcast_websocket_notifications(notifications, now)
+            else:
+                self._send_websocket_notifications(notifications, now)
 
         return notifications
 
-    def _send_websocket_notification(self, notification):
+    def _encode_client_frame(self, notification):
         """
-        Send notification via WebSocket to user's personal channel.
+        JSON-encode the client frame for a batch of same-content notifications.
 
-        Args:
-            notification: Notification object to send via WebSocket.
-        """
-        if not self.channel_layer:
-            logger.warning("Channel layer not available for WebSocket notification")
-            return
+        The frame is encoded once with a slot for the notification id, so the
+        message for each recipient is ``prefix + str(id) + suffix`` and the
+        consumers forward it without encoding it again.
 
-        # Send to user's personal notification channel
-        user_channel = f"notifications_{notification.recipient.id}"
+        Args:
+            notification: Any Notification object of the batch.
 
-        notification_data = {
-            "type": "notification_received",
-            "notification": {
-                "id": notification.id,
+        Returns:
+            tuple: (prefix, suffix) strings around the notification id.
+        """
+        content = json.dumps(
+            {
                 "type": notification.notification_type,
                 "priority": notification.priority,
                 "title": notification.title,
@@ -125,19 +183,128 @@ class NotificationService:
                 "timestamp": notification.timestamp.isoformat(),
                 "action_url": notification.action_url,
                 "action_label": notification.action_label,
-                "session_id": notification.session.id if notification.session else None,
+                "session_id": notification.session_id,
                 "sender": notification.sender.username if notification.sender else None,
+            }
+        )
+        prefix = '{"type": "new_notification", "notification": {"id": '
+        suffix = ", " + content[1:] + "}"
+        return prefix, suffix
+
+    def _send_websocket_notifications(self, notifications, sent_at):
+        """
+        Send notifications via WebSocket to each recipient's personal channel.
+
+        All group sends run concurrently inside a single event loop, so the
+        sync-to-async boundary is crossed once per batch rather than per user.
+        The notifications share their content, so the client frame is encoded
+        once and only the notification id differs between messages.
+
+        Args:
+            notifications: Notification objects sharing the same content.
+            sent_at: Time recorded as the delivery time.
+        """
+        if not notifications:
+            return
+
+        if not self.channel_layer:
+            logger.warning("Channel layer not available for WebSocket notification")
+            return
+
+        prefix, suffix = self._encode_client_frame(notifications[0])
+
+        async def broadcast():
+            await asyncio.gather(
+                *(
+                    self.channel_layer.group_send(
+                        f"notifications_{notification.recipient_id}",
+                        {
+                            "type": "notification_received",
+                            "raw": f"{prefix}{notification.id}{suffix}",
+                        },
+                    )
+                    for notification in notifications
+                )
+            )
+
+        try:
+            async_to_sync(broadcast)()
+        except Exception as e:
+            logger.error(f"Failed to send WebSocket notifications: {e}")
+            return
+
+        self._mark_delivered(notifications, sent_at)
+        logger.info(f"Sent {len(notifications)} WebSocket notifications")
+
+    def _mark_delivered(self, notifications, delivered_at):
+        """
+        Mark notifications as delivered with a single UPDATE.
+
+        Args:
+            notifications: Notification objects that were sent successfully.
+            delivered_at: Delivery time to record.
+        """
+        from notifications.models import Notification
+
+        Notification.objects.filter(
+            id__in=[notification.id for notification in notifications]
+        ).update(is_delivered=True, delivered_at=delivered_at)
+
+    def _broadcast_websocket_notifications(self, notifications, sent_at):
+        """
+        Send same-content notifications with a single channel layer publish.
+
+        The message goes to the broadcast group with a map of recipient id to
+        notification id; each NotificationConsumer delivers only its own entry.
+
+        Args:
+            notifications: Notification objects sharing the same content.
+            sent_at: Time recorded as the delivery time.
+        """
+        if not notifications:
+            return
+
+        if not self.channel_layer:
+            logger.warning("Channel layer not available for WebSocket notification")
+            return
+
+        prefix, suffix = self._encode_client_frame(notifications[0])
+        payload = {
+            "type": "notification_broadcast",
+            "raw_prefix": prefix,
+            "raw_suffix": suffix,
+            "recipients": {
+                str(notification.recipient_id): notification.id
+                for notification in notifications
             },
         }
 
         try:
             async_to_sync(self.channel_layer.group_send)(
-                user_channel, notification_data
+                NOTIFICATION_BROADCAST_GROUP, payload
             )
-            notification.mark_as_delivered()
-            logger.info(f"Notification sent to {notification.recipient.username}")
         except Exception as e:
-            logger.error(f"Failed to send WebSocket notification: {e}")
+            logger.error(f"Failed to broadcast WebSocket notifications: {e}")
+            return
+
+        self._mark_delivered(notifications, sent_at)
+        logger.info(f"Broadcast {len(notifications)} WebSocket notifications")
+
+    def _format_session_templates(self, notification_type, session, **values):
+        """
+        Format the title and message templates for a session notification.
+
+        Args:
+            notification_type: Key into the notification templates.
+            session: DebateSession the notification is about.
+            **values: Extra template values besides the topic title.
+
+        Returns:
+            tuple: Formatted (title, message).
+        """
+        title, message = _NOTIF_TEMPLATES[notification_type]
+        values["title"] = session.topic.title
+        return title.format_map(values), message.format_map(values)
 
     def send_session_notification(
         self,
@@ -157,23 +324,27 @@ class NotificationService:
         """
         Send notifications to all session participants/viewers
         """
-        recipients = []
-
-        # Get session participants and viewers
-        participations = session.participation_set.select_related("user").all()
+        roles = [
+            role
+            for role, included in (
+                ("participant", include_participants),
+                ("viewer", include_viewers),
+            )
+            if included
+        ]
 
-        for participation in participations:
-            if participation.role == "participant" and include_participants:
-                recipients.append(participation.user)
-            elif participation.role == "viewer" and include_viewers:
-                recipients.append(participation.user)
+        # Collect recipient ids; the set removes duplicates
+        user_ids = set(
+            session.participation_set.filter(role__in=roles).values_list(
+                "user_id", flat=True
+            )
+        )
 
         # Include moderator if requested
-        if include_moderator and session.moderator:
-            recipients.append(session.moderator)
+        if include_moderator and session.moderator_id:
+            user_ids.add(session.moderator_id)
 
-        # Remove duplicates
-        recipients = list(set(recipients))
+        recipients = list(User.objects.filter(id__in=user_ids).only("id", "username"))
 
         return self.send_notification(
             recipients=recipients,
@@ -193,26 +364,24 @@ class NotificationService:
         Notify all online users (excluding session participants) about a debate starting
         """
         try:
-            # Get all active users who are not already in the session
-            all_users = User.objects.filter(is_active=True)
-            session_participant_ids = session.participation_set.values_list(
-                "user_id", flat=True
+            # Get active users who are not already in the session, limited to
+            # the first 100 to avoid overwhelming the system
+            session_participant_ids = session.participation_set.values("user_id")
+            recipients = list(
+                User.objects.filter(is_active=True)
+                .exclude(id__in=session_participant_ids)
+                .only("id", "username")[:100]
             )
 
-            # Filter out users already participating in this session
-            recipients = [
-                user for user in all_users if user.id not in session_participant_ids
-            ]
-
-            # Limit to first 100 users to avoid overwhelming the system
-            recipients = recipients[:100]
-
             if recipients:
+                title, message = self._format_session_templates(
+                    "session_starting", session
+                )
                 return self.send_notification(
                     recipients=recipients,
                     notification_type="session_starting",
-                    title=f"🔥 New Debate Starting: {session.topic.title}",
-                    message=f'A new debate on "{session.topic.title}" is starting! Join now during the 5-minute joining window.',
+                    title=title,
+                    message=message,
                     sender=session.moderator,
                     session=session,
                     priority="high",
@@ -220,6 +389,7 @@ class NotificationService:
                     action_label="Join Debate",
                     expires_in_minutes=10,
                     delivery_method="websocket",
+                    fan_out=True,
                 )
         except Exception as e:
             logger.error(f"Failed to notify all users about debate starting: {e}")
@@ -232,11 +402,12 @@ class NotificationService:
         Args:
             session: DebateSession object for which joining window opened.
         """
+        title, message = self._format_session_templates("joining_opened", session)
         return self.send_session_notification(
             session=session,
             notification_type="joining_opened",
-            title=f"Debate starting: {session.topic.title}",
-            message="The joining window is now open! You have 5 minutes to join as a participant.",
+            title=title,
+            message=message,
             priority="high",
             action_url=f"/debates/{session.id}",
             action_label="Join Now",
@@ -253,11 +424,12 @@ class NotificationService:
         Args:
             session: DebateSession object for which joining window is closing.
         """
+        title, message = self._format_session_templates("joining_closing", session)
         return self.send_session_notification(
             session=session,
             notification_type="joining_closing",
-            title=f"Last chance to join: {session.topic.title}",
-            message="Joining window closes in 1 minute! Join now as a participant.",
+            title=title,
+            message=message,
             priority="urgent",
             action_url=f"/debates/{session.id}",
             action_label="Join Now",
@@ -271,11 +443,12 @@ class NotificationService:
         Args:
             session: DebateSession object for which debate started.
         """
+        title, message = self._format_session_templates("debate_started", session)
         return self.send_session_notification(
             session=session,
             notification_type="debate_started",
-            title="💬 Debate Chat Unlocked!",
-            message=f'The debate on "{session.topic.title}" has started. Participants can now chat!',
+            title=title,
+            message=message,
             sender=session.moderator,
             priority="normal",
             action_url=f"/debates/{session.id}",
@@ -290,11 +463,12 @@ class NotificationService:
         Args:
             session: DebateSession object for which voting started.
         """
+        title, message = self._format_session_templates("voting_started", session)
         return self.send_session_notification(
             session=session,
             notification_type="voting_started",
-            title="🗳️ Voting Started!",
-            message=f'The debate on "{session.topic.title}" has ended. Vote for the best participant now! (30 seconds)',
+            title=title,
+            message=message,
             sender=session.moderator,
             priority="high",
             action_url=f"/debates/{session.id}",
@@ -316,11 +490,17 @@ class NotificationService:
         if session.winner_participant:
             winner_text = f" Winner: {session.winner_participant.username}"
 
+        title, message = self._format_session_templates(
+            "session_finished",
+            session,
+            total_votes=session.total_votes,
+            winner_text=winner_text,
+        )
         return self.send_session_notification(
             session=session,
             notification_type="session_finished",
-            title=f"Debate finished: {session.topic.title}",
-            message=f"The debate has concluded with {session.total_votes} votes.{winner_text}",
+            title=title,
+            message=message,
             priority="normal",
             action_url=f"/debates/{session.id}",
             action_label="View Results",
@@ -330,14 +510,11 @@ class NotificationService:
         self, session, target_user, moderator, action, reason=""
     ):
         """Send notification for moderation actions"""
-        action_messages = {
-            "mute": f'You have been muted in "{session.topic.title}"',
-            "unmute": f'You have been unmuted in "{session.topic.title}"',
-            "warn": f'You received a warning in "{session.topic.title}"',
-            "kick": f'You have been removed from "{session.topic.title}"',
-        }
-
-        message = action_messages.get(action, f"Moderation action: {action}")
+        template = _MOD_ACTION_TEMPLATES.get(action)
+        if template:
+            message = template.format_map({"title": session.topic.title})
+        else:
+            message = f"Moderation action: {action}"
         if reason:
             message += f" Reason: {reason}"
 
@@ -352,40 +529,29 @@ class NotificationService:
         )
 
     def get_user_notifications(self, user, unread_only=False, limit=50):
-        """Get notifications for a user"""
-        queryset = user.debate_notifications.select_related("sender", "session__topic")
+        """Get notifications for a user, loading only the listed columns"""
+        queryset = user.notifications.only(
+            "id", "title", "message", "type", "is_read", "created_at"
+        )
 
         if unread_only:
             queryset = queryset.filter(is_read=False)
 
-        # Filter out expired notifications
-        queryset = queryset.filter(
-            models.Q(expires_at__isnull=True) | models.Q(expires_at__gt=timezone.now())
-        )
-
         return list(queryset[:limit])
 
     def mark_notifications_as_read(self, user, notification_ids=None):
         """Mark notifications as read"""
-        queryset = user.debate_notifications.filter(is_read=False)
+        queryset = user.notifications.filter(is_read=False)
 
         if notification_ids:
             queryset = queryset.filter(id__in=notification_ids)
 
-        updated_count = queryset.update(is_read=True, read_at=timezone.now())
-
-        return updated_count
+        return queryset.update(is_read=True)
 
     def get_unread_count(self, user):
         """Get count of unread notifications for user"""
-        return (
-            user.debate_notifications.filter(is_read=False, is_dismissed=False)
-            .filter(
-                models.Q(expires_at__isnull=True)
-                | models.Q(expires_at__gt=timezone.now())
-            )
-            .count()
-        )
+        # Served by the partial idx_notification_unread index
+        return user.notifications.filter(is_read=False).count()
 
 
 # Global service instance
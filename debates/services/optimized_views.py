@@ -1,12 +1,91 @@
+import time
+
 from debates.models import DebateSession, Message, Participation
-from debates.serializers import DebateSessionSerializer
+from debates.serializers import SESSION_MESSAGE_LIMIT
 from django.core.cache import cache
-from django.db.models import Count, Prefetch, Q
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
+from django.db.models import F, Prefetch, TextField
+from django.db.models.functions import Cast, JSONObject
+from django.http import Http404, HttpResponse
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+# Row shape for the read-only list endpoints, assembled by the database
+SESSION_LIST_JSON = JSONObject(
+    id="id",
+    status="status",
+    scheduled_start="scheduled_start",
+    duration_minutes="duration_minutes",
+    total_votes="total_votes",
+    created_at="created_at",
+    updated_at="updated_at",
+    topic=JSONObject(id="topic__id", title="topic__title"),
+    moderator=JSONObject(id="moderator__id", username="moderator__username"),
+    participant_count="participant_count",
+    viewer_count="viewer_count",
+    message_count="message_count",
+)
+
+# Columns read by the nested serializers; everything else stays in the database
+USER_FIELDS = ["id", "username", "email", "role", "is_active"]
+PARTICIPATION_FIELDS = [
+    "id",
+    "session",
+    "role",
+    "joined_at",
+    "is_muted",
+    "warnings_count",
+    "messages_sent",
+    *(f"user__{field}" for field in USER_FIELDS),
+]
+MESSAGE_FIELDS = [
+    "id",
+    "session",
+    "content",
+    "timestamp",
+    "message_type",
+    "image_url",
+    *(f"user__{field}" for field in USER_FIELDS),
+]
+
+
+def render_sessions_json(queryset):
+    """
+    Build a JSON array of sessions in the database.
+
+    Each row is rendered to JSON text by the database and the rows are
+    joined as-is, so no per-field serialization happens in Python.
+
+    Args:
+        queryset: DebateSession queryset to render.
+
+    Returns:
+        str: JSON array of session objects.
+    """
+    rows = queryset.annotate(
+        row_json=Cast(SESSION_LIST_JSON, output_field=TextField())
+    ).values_list("row_json", flat=True)
+    return "[" + ",".join(rows) + "]"
+
+
+SESSION_LIST_CACHE_TIMEOUT = 60 * 5
+SESSION_LIST_VERSION_KEY = "debate_sessions_list_version"
+
+
+def session_list_cache_key(querystring):
+    """Cache key for one page of the session list, scoped to the current version."""
+    version = cache.get_or_set(SESSION_LIST_VERSION_KEY, time.time_ns(), None)
+    return f"debate_sessions_list:{version}:{querystring}"
+
+
+def invalidate_session_list_cache():
+    """Invalidate every cached session list page and the popular sessions."""
+    try:
+        cache.incr(SESSION_LIST_VERSION_KEY)
+    except ValueError:
+        # Version key missing or evicted; start from a fresh unique value
+        cache.set(SESSION_LIST_VERSION_KEY, time.time_ns(), None)
+    cache.delete("popular_sessions")
+
 
 class OptimizedDebateSessionViewSet:
     """
@@ -14,40 +93,49 @@ class OptimizedDebateSessionViewSet:
     These can be integrated into the main views.py file
     """
 
+    def get_list_queryset(self):
+        """Slim queryset for list views: related topic/moderator and counts only"""
+        # The participant, viewer and message counts are columns on the session
+        return DebateSession.objects.select_related("topic", "moderator")
+
     def get_queryset(self):
         """Optimized queryset with select_related and prefetch_related"""
-        return (
-            DebateSession.objects.select_related("topic", "moderator")
-            .prefetch_related(
-                Prefetch(
-                    "participation_set",
-                    queryset=Participation.objects.select_related("user"),
-                ),
-                Prefetch(
-                    "messages",
-                    queryset=Message.objects.select_related("author").order_by(
-                        "-timestamp"
-                    )[:20],
-                ),
-                "votes__voter",
-            )
-            .annotate(
-                participant_count=Count(
-                    "participation_set", filter=Q(participation_set__role="participant")
-                ),
-                viewer_count=Count(
-                    "participation_set", filter=Q(participation_set__role="viewer")
-                ),
-                message_count=Count("messages"),
-            )
+        participations = Participation.objects.select_related("user").only(
+            *PARTICIPATION_FIELDS
+        )
+        return self.get_list_queryset().prefetch_related(
+            Prefetch("participation_set", queryset=participations),
+            Prefetch(
+                "participation_set",
+                queryset=participations.filter(role="participant"),
+                to_attr="active_participations",
+            ),
+            Prefetch(
+                "participation_set",
+                queryset=participations.filter(role="viewer"),
+                to_attr="viewer_participations",
+            ),
+            Prefetch(
+                "messages",
+                queryset=Message.objects.select_related("user")
+                .only(*MESSAGE_FIELDS)
+                .order_by("-timestamp")[:SESSION_MESSAGE_LIMIT],
+                to_attr="recent_messages",
+            ),
         )
 
-    @method_decorator(cache_page(60 * 5))  # Cache for 5 minutes
     def list(self, request):
-        """Cached list view for sessions"""
-        queryset = self.get_queryset()
-        serializer = DebateSessionSerializer(queryset, many=True)
-        return Response(serializer.data)
+        """Cached list view for sessions, rendered to JSON by the database"""
+        cache_key = session_list_cache_key(request.GET.urlencode())
+        payload = cache.get(cache_key)
+
+        if payload is None:
+            payload = render_sessions_json(
+                self.get_list_queryset().order_by("-created_at")
+            )
+            cache.set(cache_key, payload, SESSION_LIST_CACHE_TIMEOUT)
+
+        return HttpResponse(payload, content_type="application/json")
 
     @action(detail=True, methods=["get"])
     def statistics(self, request, pk=None):
@@ -56,18 +144,25 @@ class OptimizedDebateSessionViewSet:
         stats = cache.get(cache_key)
 
         if not stats:
-            session = self.get_object()
-            stats = {
-                "total_participants": session.participation_set.count(),
-                "active_participants": session.participation_set.filter(
-                    role="participant"
-                ).count(),
-                "viewers": session.participation_set.filter(role="viewer").count(),
-                "total_messages": session.messages.count(),
-                "total_votes": session.votes.count(),
-                "status": session.status,
-                "duration_minutes": session.duration_minutes,
-            }
+            # Every count is a running column on the session row
+            stats = (
+                DebateSession.objects.filter(pk=pk)
+                .values(
+                    "status",
+                    "duration_minutes",
+                    total_participants=F("participant_count") + F("viewer_count"),
+                    active_participants=F("participant_count"),
+                    viewers=F("viewer_count"),
+                    total_messages=F("message_count"),
+                    total_vote_count=(
+                        F("best_argument_vote_count") + F("winning_side_vote_count")
+                    ),
+                )
+                .first()
+            )
+            if stats is None:
+                raise Http404("No DebateSession matches the given query.")
+            stats["total_votes"] = stats.pop("total_vote_count")
             # Cache for 2 minutes
             cache.set(cache_key, stats, 120)
 
@@ -81,15 +176,14 @@ class OptimizedDebateSessionViewSet:
 
         if not popular_sessions:
             sessions = (
-                self.get_queryset()
+                self.get_list_queryset()
                 .filter(participant_count__gt=0)
                 .order_by("-participant_count", "-message_count")[:10]
             )
 
-            serializer = DebateSessionSerializer(sessions, many=True)
-            popular_sessions = serializer.data
+            popular_sessions = render_sessions_json(sessions)
 
             # Cache for 10 minutes
             cache.set(cache_key, popular_sessions, 600)
 
-        return Response(popular_sessions)
+        return HttpResponse(popular_sessions, content_type="application/json")
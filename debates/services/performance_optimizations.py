@@ -1,26 +1,58 @@
 # Performance Optimization for Django Online Debate Platform
 # This file contains optimized view methods and caching strategies
 
-import json
+import logging
+import time
 from datetime import timedelta
+from functools import wraps
 
+from django.conf import settings
 from django.core.cache import cache
-from django.db.models import Count, Prefetch, Q
+from django.db import connection
+from django.db.models import Count, F, Prefetch, Q
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
-from rest_framework.decorators import action
-from rest_framework.response import Response
 
 # Import models
+from notifications.models import Notification
+
 from ..models import (
     DebateSession,
     DebateTopic,
-    DebateVote,
     Message,
-    Notification,
     Participation,
 )
+from ..serializers import SESSION_MESSAGE_LIMIT
+from .redis_client import get_redis_client
+
+try:
+    from fast_update.fast import fast_update
+except ImportError:  # Optional dependency
+    fast_update = None
+
+logger = logging.getLogger(__name__)
+
+# How long one caller may hold a recompute lock, and how long the last
+# computed value of a collection is kept to serve while it is recomputed
+RECOMPUTE_LOCK_TIMEOUT = 30
+STALE_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+class _PrecountedQuerySet:
+    """Queryset wrapper whose count() returns a row count computed beforehand."""
+
+    def __init__(self, queryset, count):
+        self._queryset = queryset
+        self._count = count
+
+    def count(self):
+        return self._count
+
+    def __getitem__(self, key):
+        return self._queryset[key]
+
+    def __getattr__(self, name):
+        return getattr(self._queryset, name)
 
 
 # Mixin for adding performance optimizations to views
@@ -29,9 +61,13 @@ class PerformanceOptimizedMixin:
     Mixin to add performance optimizations to ViewSets
     """
 
+    def get_base_queryset(self):
+        """Queryset without annotations or prefetches, used for counting rows"""
+        return super().get_queryset()
+
     def get_queryset(self):
         """Optimize querysets with select_related and prefetch_related"""
-        queryset = super().get_queryset()
+        queryset = self.get_base_queryset()
 
         # For DebateSessionViewSet
         if hasattr(self, "serializer_class") and "DebateSession" in str(
@@ -41,15 +77,19 @@ class PerformanceOptimizedMixin:
                 Prefetch(
                     "participation_set",
                     queryset=Participation.objects.select_related("user"),
-                ),
-                Prefetch(
-                    "messages",
-                    queryset=Message.objects.select_related("author").order_by(
-                        "-timestamp"
-                    )[:50],
-                ),
-                "votes__voter",
+                )
             )
+            # Messages are only rendered on detail views
+            if getattr(self, "action", None) != "list":
+                queryset = queryset.prefetch_related(
+                    Prefetch(
+                        "messages",
+                        queryset=Message.objects.select_related("user").order_by(
+                            "-timestamp"
+                        )[:SESSION_MESSAGE_LIMIT],
+                        to_attr="recent_messages",
+                    )
+                )
 
         # For DebateTopicViewSet
         elif hasattr(self, "serializer_class") and "DebateTopic" in str(
@@ -59,12 +99,26 @@ class PerformanceOptimizedMixin:
                 session_count=Count("sessions"),
                 active_session_count=Count(
                     "sessions",
-                    filter=Q(sessions__status__in=["scheduled", "joining", "active"]),
+                    filter=Q(sessions__status__in=["open", "closed", "online"]),
                 ),
             )
 
         return queryset
 
+    def paginate_queryset(self, queryset):
+        """
+        Paginate the queryset, counting rows on the unannotated base queryset.
+
+        Counting the annotated queryset would GROUP BY every annotation only to
+        count rows; a plain COUNT over the same filters gives the same total.
+        """
+        if self.paginator is None:
+            return None
+        count = self.filter_queryset(self.get_base_queryset()).count()
+        return self.paginator.paginate_queryset(
+            _PrecountedQuerySet(queryset, count), self.request, view=self
+        )
+
     def get_cached_data(self, cache_key, cache_timeout=300):
         """Generic method to get cached data"""
         return cache.get(cache_key)
@@ -80,43 +134,42 @@ class PerformanceOptimizedMixin:
 
 def get_session_statistics(session_id, use_cache=True):
     """Get comprehensive session statistics with caching"""
-    cache_key = f"session_stats_{session_id}"
+    cache_key = _versioned_cache_key(f"session_stats_{session_id}")
 
     if use_cache:
         cached_stats = cache.get(cache_key)
-        if cached_stats:
+        if cached_stats is not None:
             return cached_stats
 
     try:
-        session = DebateSession.objects.select_related("topic", "moderator").get(
-            id=session_id
+        # Only the status is read from the session row itself
+        session = DebateSession.objects.only("id", "status").get(id=session_id)
+
+        # Get participant statistics in one aggregate query
+        participant_stats = session.participation_set.aggregate(
+            total_participants=Count("id"),
+            active_participants=Count("id", filter=Q(role="participant")),
+            viewers=Count("id", filter=Q(role="viewer")),
+            muted_users=Count("id", filter=Q(is_muted=True)),
         )
 
-        # Get participant statistics
-        participants = session.participation_set.select_related("user").all()
-        participant_stats = {
-            "total_participants": participants.count(),
-            "active_participants": participants.filter(role="participant").count(),
-            "viewers": participants.filter(role="viewer").count(),
-            "muted_users": participants.filter(is_muted=True).count(),
-        }
-
-        # Get message statistics
-        message_stats = {
-            "total_messages": session.messages.count(),
-            "recent_messages": session.messages.filter(
-                timestamp__gte=timezone.now() - timedelta(minutes=30)
-            ).count(),
-        }
+        # Get message statistics in one aggregate query
+        message_stats = session.messages.aggregate(
+            total_messages=Count("id"),
+            recent_messages=Count(
+                "id", filter=Q(timestamp__gte=timezone.now() - timedelta(minutes=30))
+            ),
+        )
 
-        # Get voting statistics
+        # Get voting statistics; the total is derived from the distribution
+        vote_distribution = dict(
+            session.votes.values("vote_type")
+            .annotate(count=Count("id"))
+            .values_list("vote_type", "count")
+        )
         vote_stats = {
-            "total_votes": session.votes.count(),
-            "vote_distribution": dict(
-                session.votes.values("vote")
-                .annotate(count=Count("vote"))
-                .values_list("vote", "count")
-            ),
+            "total_votes": sum(vote_distribution.values()),
+            "vote_distribution": vote_distribution,
         }
 
         stats = {
@@ -141,56 +194,90 @@ def get_session_statistics(session_id, use_cache=True):
 # Database query optimization functions
 
 
-def get_popular_topics(limit=10):
-    """Get popular topics with session count"""
-    cache_key = "popular_topics"
-    cached_topics = cache.get(cache_key)
+def _versioned_cache_key(name):
+    """Return the cache key for the current version of a cached collection."""
+    version = cache.get_or_set(f"{name}:ver", time.time_ns(), None)
+    return f"{name}:{version}"
 
-    if cached_topics:
-        return cached_topics
 
-    topics = DebateTopic.objects.annotate(
-        session_count=Count("sessions"),
-        recent_session_count=Count(
-            "sessions",
-            filter=Q(sessions__created_at__gte=timezone.now() - timedelta(days=30)),
-        ),
-    ).order_by("-session_count", "-recent_session_count")[:limit]
+def _bump_cache_version(name):
+    """Move a cached collection to a new version so readers miss the old entry."""
+    try:
+        cache.incr(f"{name}:ver")
+    except ValueError:
+        # Version key missing or evicted; start from a fresh unique value
+        cache.set(f"{name}:ver", time.time_ns(), None)
 
-    # Cache for 1 hour
-    cache.set(cache_key, list(topics.values()), 3600)
-    return topics
 
+def _get_or_compute(cache_key, stale_key, compute, timeout):
+    """
+    Return the cached value, letting a single caller recompute it on a miss.
 
-def get_active_sessions_optimized():
-    """Get active sessions with optimized queries"""
-    cache_key = "active_sessions"
-    cached_sessions = cache.get(cache_key)
+    Callers that miss while another one holds the recompute lock are served
+    the last computed value from the stale copy instead of querying too.
+    """
+    value = cache.get(cache_key)
+    if value is not None:
+        return value
+
+    lock_key = f"lock:{stale_key}"
+    locked = cache.add(lock_key, 1, RECOMPUTE_LOCK_TIMEOUT)
+    if not locked:
+        value = cache.get(stale_key)
+        if value is not None:
+            return value
+        # Nothing computed yet; fall through rather than return nothing
 
-    if cached_sessions:
-        return cached_sessions
+    try:
+        value = compute()
+        cache.set(cache_key, value, timeout)
+        cache.set(stale_key, value, STALE_CACHE_TIMEOUT)
+    finally:
+        if locked:
+            cache.delete(lock_key)
+    return value
 
-    sessions = (
-        DebateSession.objects.filter(
-            status__in=["scheduled", "joining", "active", "voting"]
-        )
-        .select_related("topic", "moderator")
-        .prefetch_related("participation_set__user", "messages__author")
-        .annotate(
-            participant_count=Count(
-                "participation_set", filter=Q(participation_set__role="participant")
-            ),
-            viewer_count=Count(
-                "participation_set", filter=Q(participation_set__role="viewer")
+
+def get_popular_topics(limit=10):
+    """Get popular topics with session count"""
+
+    def compute():
+        topics = DebateTopic.objects.annotate(
+            session_count=Count("sessions"),
+            recent_session_count=Count(
+                "sessions",
+                filter=Q(sessions__created_at__gte=timezone.now() - timedelta(days=30)),
             ),
-            message_count=Count("messages"),
-        )
-        .order_by("scheduled_start")
+        ).order_by("-session_count", "-recent_session_count")[:limit]
+        return list(topics.values())
+
+    # Invalidated on session writes; the 24 hour TTL is only a safety net
+    return _get_or_compute(
+        f"{_versioned_cache_key('popular_topics')}:{limit}",
+        f"popular_topics:{limit}:stale",
+        compute,
+        60 * 60 * 24,
     )
 
-    # Cache for 2 minutes (short cache for active data)
-    cache.set(cache_key, list(sessions.values()), 120)
-    return sessions
+
+def get_active_sessions_optimized():
+    """Get active sessions with optimized queries"""
+
+    def compute():
+        # Only the values() columns, running counts included, are read, so
+        # nothing is prefetched or select_related here
+        sessions = DebateSession.objects.filter(
+            status__in=["open", "closed", "online", "voting"]
+        ).order_by("scheduled_start")
+        return list(sessions.values())
+
+    # Invalidated on session writes; the 10 minute TTL is only a safety net
+    return _get_or_compute(
+        _versioned_cache_key("active_sessions"),
+        "active_sessions:stale",
+        compute,
+        60 * 10,
+    )
 
 
 def get_user_session_history(user_id, limit=20):
@@ -201,26 +288,21 @@ def get_user_session_history(user_id, limit=20):
     if cached_history:
         return cached_history
 
-    participations = (
+    # values() builds the joins and returns dicts without instantiating models
+    history = list(
         Participation.objects.filter(user_id=user_id)
-        .select_related("session__topic", "session__moderator")
+        .values(
+            "session_id",
+            "role",
+            "joined_at",
+            "messages_sent",
+            "has_voted",
+            topic_title=F("session__topic__title"),
+            status=F("session__status"),
+        )
         .order_by("-joined_at")[:limit]
     )
 
-    history = []
-    for participation in participations:
-        history.append(
-            {
-                "session_id": participation.session.id,
-                "topic_title": participation.session.topic.title,
-                "role": participation.role,
-                "joined_at": participation.joined_at,
-                "status": participation.session.status,
-                "messages_sent": participation.messages_sent,
-                "has_voted": participation.has_voted,
-            }
-        )
-
     # Cache for 10 minutes
     cache.set(cache_key, history, 600)
     return history
@@ -231,12 +313,9 @@ def get_user_session_history(user_id, limit=20):
 
 def invalidate_session_cache(session_id):
     """Invalidate all cache entries related to a session"""
-    cache_keys = [
-        f"session_stats_{session_id}",
-        "active_sessions",
-        "popular_topics",
-    ]
-    cache.delete_many(cache_keys)
+    _bump_cache_version(f"session_stats_{session_id}")
+    _bump_cache_version("active_sessions")
+    _bump_cache_version("popular_topics")
 
 
 def invalidate_user_cache(user_id):
@@ -253,11 +332,26 @@ def invalidate_user_cache(user_id):
 def bulk_create_notifications(notifications_data):
     """Bulk create notifications for better performance"""
     notifications = [Notification(**data) for data in notifications_data]
-    return Notification.objects.bulk_create(notifications, batch_size=100)
+    return Notification.objects.bulk_create(
+        notifications, batch_size=settings.DEBATE_BULK_BATCH_SIZE
+    )
 
 
 def bulk_update_participations(participations, fields):
-    """Bulk update participations"""
+    """
+    Bulk update participations.
+
+    On PostgreSQL with django-fast-update installed, each batch is written as
+    a single UPDATE ... FROM (VALUES ...) statement. Other databases fall back
+    to bulk_update.
+    """
+    if fast_update is not None and connection.vendor == "postgresql":
+        return fast_update(
+            Participation.objects.all(),
+            participations,
+            fields,
+            settings.DEBATE_BULK_BATCH_SIZE,
+        )
     return Participation.objects.bulk_update(participations, fields, batch_size=100)
 
 
@@ -265,26 +359,25 @@ def bulk_update_participations(participations, fields):
 
 
 def monitor_query_count(func):
-    """Decorator to monitor database query count"""
-
-    def wrapper(*args, **kwargs):
-        from django.db import connection
-
-        initial_queries = len(connection.queries)
+    """
+    Decorator to monitor database query count.
 
-        result = func(*args, **kwargs)
+    Queries are only recorded when DEBUG is on; otherwise the function is
+    returned undecorated so production calls pay no overhead.
+    """
+    if not settings.DEBUG:
+        return func
 
-        final_queries = len(connection.queries)
-        query_count = final_queries - initial_queries
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with CaptureQueriesContext(connection) as ctx:
+            result = func(*args, **kwargs)
+        query_count = len(ctx)
 
         # Log if too many queries
         if query_count > 10:
-            import logging
-
-            logger = logging.getLogger(__name__)
             logger.warning(
-                f"High query count in {
-                    func.__name__}: {query_count} queries"
+                f"High query count in {func.__name__}: {query_count} queries"
             )
 
         return result
@@ -297,19 +390,23 @@ def monitor_query_count(func):
 
 def get_real_time_session_data(session_id):
     """Get real-time session data with Redis fallback"""
-    try:
-        import redis
+    redis_client = get_redis_client()
 
-        redis_client = redis.Redis(host="localhost", port=6379, db=0)
+    if redis_client is not None:
+        import msgpack
+        import redis
 
         # Try to get from Redis first
-        redis_key = f"session_realtime_{session_id}"
-        cached_data = redis_client.get(redis_key)
+        try:
+            cached_data = redis_client.get(f"session_realtime_{session_id}")
+        except redis.RedisError:
+            cached_data = None  # Redis not available, fall back to Django cache
 
         if cached_data:
-            return json.loads(cached_data)
-    except (ImportError, ConnectionError):
-        pass  # Redis not available, fall back to Django cache
+            try:
+                return msgpack.unpackb(cached_data)
+            except ValueError:
+                pass  # Written in an older format; treat as a miss
 
     # Fallback to Django cache
     return cache.get(f"session_realtime_{session_id}")
@@ -317,16 +414,20 @@ def get_real_time_session_data(session_id):
 
 def set_real_time_session_data(session_id, data, expire_seconds=60):
     """Set real-time session data with Redis fallback"""
-    try:
-        import redis
+    redis_client = get_redis_client()
 
-        redis_client = redis.Redis(host="localhost", port=6379, db=0)
+    if redis_client is not None:
+        import msgpack
+        import redis
 
-        redis_key = f"session_realtime_{session_id}"
-        redis_client.setex(redis_key, expire_seconds, json.dumps(data))
-        return True
-    except (ImportError, ConnectionError):
-        pass  # Redis not available, fall back to Django cache
+        try:
+            # MessagePack is smaller and quicker to decode than JSON text
+            redis_client.setex(
+                f"session_realtime_{session_id}", expire_seconds, msgpack.packb(data)
+            )
+            return True
+        except redis.RedisError:
+            pass  # Redis not available, fall back to Django cache
 
     # Fallback to Django cache
     cache.set(f"session_realtime_{session_id}", data, expire_seconds)
@@ -0,0 +1,28 @@
+"""
+Shared Redis connection for services that talk to Redis directly.
+
+All callers share one client backed by a connection pool, so lookups reuse
+open connections instead of opening a new TCP connection per call.
+"""
+
+from django.conf import settings
+
+MAX_CONNECTIONS = 64
+
+_redis_client = None
+
+
+def get_redis_client():
+    """Return the shared Redis client, or None if Redis is not installed."""
+    global _redis_client
+
+    if _redis_client is None:
+        try:
+            import redis
+        except ImportError:
+            return None
+        pool = redis.ConnectionPool.from_url(
+            settings.REDIS_URL, max_connections=MAX_CONNECTIONS
+        )
+        _redis_client = redis.Redis(connection_pool=pool)
+    return _redis_client
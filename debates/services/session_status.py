@@ -0,0 +1,151 @@
+"""
+Phase-aware session status shared by the HTTP status endpoint and the
+debate WebSocket.
+
+The payload is cached per session for a phase-dependent TTL and dropped by
+the session and participation signal handlers. It stores the next phase
+start as an absolute time, so each reader derives an exact countdown from
+it without touching the database.
+"""
+
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.utils import timezone
+
+from ..models import DebateSession
+
+# How long a status payload is cached in each phase: briefly while the
+# session is live, longer while nothing is about to change. A copy is also
+# kept for STATUS_STALE_TIMEOUT to answer readers while the database is down.
+STATUS_CACHE_TIMEOUTS = {
+    "offline": 30,
+    "open": 5,
+    "closed": 5,
+    "online": 3,
+    "voting": 3,
+    "ended": 60,
+}
+STATUS_STALE_TIMEOUT = 60 * 60
+
+
+def status_cache_key(session_id):
+    """Cache key for a session's status payload, dropped when it changes."""
+    return f"session_status:{session_id}"
+
+
+def countdown_cache_key(session_id):
+    """Cache key for a session's countdown payload, dropped on every session save."""
+    return f"session_countdown:{session_id}"
+
+
+def compute_status(session):
+    """Build the status payload, with the next phase as an absolute time."""
+    now = timezone.now()
+
+    # Determine current phase based on timestamps; a phase whose end isn't
+    # scheduled yet (e.g. closed before the debate start is set) lasts until it is
+    if session.status in ("finished", "cancelled"):
+        phase = "ended"
+    elif not session.joining_started_at or now < session.joining_started_at:
+        phase = "offline"
+    elif not session.joining_window_end or now < session.joining_window_end:
+        phase = "open"
+    elif not session.debate_started_at or now < session.debate_started_at:
+        phase = "closed"
+    elif not session.debate_end_time or now < session.debate_end_time:
+        phase = "online"
+    elif session.voting_end_time and now < session.voting_end_time:
+        phase = "voting"
+    else:
+        phase = "ended"
+
+    # Find when the next phase starts
+    next_phase_at = None
+    next_phase_label = None
+
+    if phase == "offline" and session.joining_started_at:
+        next_phase_at = session.joining_started_at
+        next_phase_label = "Joining opens"
+    elif phase == "open" and session.joining_window_end:
+        next_phase_at = session.joining_window_end
+        next_phase_label = "Joining closes"
+    elif phase == "closed" and session.debate_started_at:
+        next_phase_at = session.debate_started_at
+        next_phase_label = "Debate starts"
+    elif phase == "online" and session.debate_end_time:
+        next_phase_at = session.debate_end_time
+        next_phase_label = "Voting begins"
+    elif phase == "voting" and session.voting_end_time:
+        next_phase_at = session.voting_end_time
+        next_phase_label = "Session ends"
+
+    return {
+        "phase": phase,
+        "canJoin": phase == "open",
+        "canChat": phase == "online",
+        "canVote": phase == "voting",
+        "nextPhaseAt": next_phase_at,
+        "nextPhaseLabel": next_phase_label,
+        # Running counts kept on the session row by the signal handlers
+        "participantCount": session.participant_count,
+        "viewerCount": session.viewer_count,
+        "messageCount": session.message_count,
+        "sessionInfo": {
+            "id": session.id,
+            "title": session.topic.title,
+            "description": session.topic.description,
+            "moderator": (session.moderator.username if session.moderator else None),
+            "duration_minutes": session.duration_minutes,
+            "created_at": session.created_at.isoformat(),
+        },
+    }
+
+
+def _load_session(session_id):
+    return DebateSession.objects.select_related("topic", "moderator").get(pk=session_id)
+
+
+def get_session_status(session_id, load_session=None):
+    """
+    Return the status payload of a session, from the cache when possible.
+
+    Args:
+        session_id: ID of the DebateSession
+        load_session: Callable returning the session on a cache miss;
+            defaults to loading it with its topic and moderator
+
+    Returns:
+        dict: JSON-serializable status, with countdownToNextPhase in seconds
+    """
+    key = status_cache_key(session_id)
+    data = cache.get(key)
+    if data is None:
+        try:
+            if load_session is None:
+                data = compute_status(_load_session(session_id))
+            else:
+                data = compute_status(load_session())
+        except DatabaseError:
+            # Answer from the last known status while the database is down
+            data = cache.get(f"{key}:stale")
+            if data is None:
+                raise
+        else:
+            timeout = STATUS_CACHE_TIMEOUTS[data["phase"]]
+            if data["nextPhaseAt"]:
+                # Don't serve this phase past its end
+                until_next = (data["nextPhaseAt"] - timezone.now()).total_seconds()
+                timeout = max(1, min(timeout, int(until_next)))
+            cache.set(key, data, timeout)
+            cache.set(f"{key}:stale", data, STATUS_STALE_TIMEOUT)
+
+    # The countdown is recomputed per reader, so cached payloads stay exact
+    next_phase_at = data["nextPhaseAt"]
+    countdown = None
+    if next_phase_at:
+        countdown = max(0, int((next_phase_at - timezone.now()).total_seconds()))
+    return {
+        **data,
+        "nextPhaseAt": next_phase_at.isoformat() if next_phase_at else None,
+        "countdownToNextPhase": countdown,
+    }
@@ -0,0 +1,170 @@
+"""
+Buffered vote ingestion for the voting window.
+
+Votes cast during the 30-second voting period arrive in bursts. Instead of
+issuing one INSERT per ballot, votes are pushed onto a per-session Redis
+list and flushed in batches with a single multi-row INSERT. When Redis is
+not available votes are written straight through to the database.
+
+A buffered ballot only reaches the one-vote-per-user constraint at flush
+time, so each voter is also claimed in a per-session Redis set when their
+ballot is queued. A second ballot fails the claim and is rejected up front
+with IntegrityError, the same as a duplicate written to the database.
+"""
+
+import json
+import logging
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from ..models import DebateSession, Vote
+from .redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+FLUSH_BATCH_SIZE = 5000
+
+# Safety net for claims of sessions whose buffer is never flushed
+VOTER_CLAIM_TIMEOUT = 60 * 60
+
+
+def _buffer_key(session_id):
+    return f"vote_buffer_{session_id}"
+
+
+def _voters_key(session_id):
+    return f"vote_voters_{session_id}"
+
+
+def _bulk_insert(session_id, votes):
+    """Insert votes in batches, skipping any (session, user) pair already stored."""
+    Vote.objects.bulk_create(votes, batch_size=FLUSH_BATCH_SIZE, ignore_conflicts=True)
+    # Skipped conflicts are not reported, so recount rather than add
+    DebateSession.recount_votes(session_id)
+
+
+def buffer_vote(session_id, user_id, vote_type):
+    """
+    Queue a vote for the next flush of its session.
+
+    Args:
+        session_id: ID of the DebateSession the vote belongs to.
+        user_id: ID of the voting user.
+        vote_type: BEST_ARGUMENT or WINNING_SIDE.
+
+    Returns:
+        bool: True if the vote was buffered, False if it was written directly.
+
+    Raises:
+        IntegrityError: If the user already has a ballot in this session,
+            buffered or stored.
+    """
+    created_at = timezone.now()
+    client = get_redis_client()
+
+    if client is not None:
+        import redis
+
+        payload = json.dumps(
+            {
+                "user_id": user_id,
+                "vote_type": vote_type,
+                "created_at": created_at.isoformat(),
+            }
+        )
+        voters_key = _voters_key(session_id)
+        try:
+            pipe = client.pipeline(transaction=True)
+            pipe.sadd(voters_key, user_id)
+            pipe.expire(voters_key, VOTER_CLAIM_TIMEOUT)
+            claimed, _ = pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Vote buffer unavailable, writing directly: {e}")
+        else:
+            if not claimed:
+                raise IntegrityError(
+                    f"User {user_id} already voted in session {session_id}"
+                )
+            try:
+                client.rpush(_buffer_key(session_id), payload)
+                return True
+            except redis.RedisError as e:
+                logger.warning(f"Vote buffer unavailable, writing directly: {e}")
+                # The ballot goes to the database, whose constraint takes over
+                try:
+                    client.srem(voters_key, user_id)
+                except redis.RedisError:
+                    pass
+
+    # Written on its own rather than batched, so a duplicate raises instead of
+    # being skipped like a conflicting row in a flush
+    with transaction.atomic():
+        Vote.objects.create(
+            debate_session_id=session_id,
+            user_id=user_id,
+            vote_type=vote_type,
+            created_at=created_at,
+        )
+        DebateSession.recount_votes(session_id)
+    return False
+
+
+def flush_votes(session_id):
+    """
+    Drain the buffered votes of a session into the database.
+
+    The Redis list is read and cleared atomically, duplicate ballots from the
+    same user are dropped (first vote wins) and the remainder is written with
+    one batched INSERT that ignores rows violating the one-vote-per-user
+    constraint. The flushed voters' claims are then released, as their
+    stored ballots now block a second vote.
+
+    Args:
+        session_id: ID of the DebateSession to flush.
+
+    Returns:
+        int: Number of buffered votes submitted for insertion.
+    """
+    client = get_redis_client()
+    if client is None:
+        return 0
+
+    import redis
+
+    key = _buffer_key(session_id)
+    try:
+        pipe = client.pipeline(transaction=True)
+        pipe.lrange(key, 0, -1)
+        pipe.delete(key)
+        raw_votes, _ = pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Failed to drain vote buffer for session {session_id}: {e}")
+        return 0
+
+    votes = {}
+    for raw in raw_votes:
+        data = json.loads(raw)
+        if data["user_id"] in votes:
+            continue
+        votes[data["user_id"]] = Vote(
+            debate_session_id=session_id,
+            user_id=data["user_id"],
+            vote_type=data["vote_type"],
+            created_at=parse_datetime(data["created_at"]),
+        )
+
+    if votes:
+        _bulk_insert(session_id, list(votes.values()))
+        logger.info(f"Flushed {len(votes)} buffered votes for session {session_id}")
+
+        # These voters' ballots are stored now, where the unique constraint
+        # and the view's lookup reject another one; voters claimed since the
+        # drain keep their claims
+        try:
+            client.srem(_voters_key(session_id), *votes)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to release voter claims for {session_id}: {e}")
+
+    return len(votes)
@@ -24,35 +24,30 @@ class VotingService:
             participation__role=ParticipantRole.PARTICIPANT
         )
 
-        if not participants.exists():
-            return None
-
-        # Count votes for each participant
-        vote_counts = {}
-        for participant in participants:
-            vote_count = Participation.objects.filter(
-                session=session, voted_for=participant, has_voted=True
-            ).count()
-            vote_counts[participant] = vote_count
+        votes = Participation.objects.filter(
+            session=session, has_voted=True, voted_for__in=participants
+        )
 
-        # Find winner (participant with most votes)
-        if not vote_counts:
-            return None
+        # Only the two best-placed participants are needed to find a winner or tie
+        top_two = list(
+            votes.values("voted_for")
+            .annotate(vote_count=Count("id"))
+            .order_by("-vote_count")[:2]
+        )
 
-        max_votes = max(vote_counts.values())
-        if max_votes == 0:
+        # No participants or no votes cast for them
+        if not top_two:
             return None
 
         # Check for ties
-        winners = [user for user, votes in vote_counts.items() if votes == max_votes]
-        if len(winners) > 1:
+        if len(top_two) > 1 and top_two[1]["vote_count"] == top_two[0]["vote_count"]:
             return None  # Tie - no winner
 
         # Update total votes count
-        session.total_votes = sum(vote_counts.values())
+        session.total_votes = votes.count()
         session.save(update_fields=["total_votes"])
 
-        return winners[0]
+        return User.objects.get(pk=top_two[0]["voted_for"])
 
     @staticmethod
     def update_winner_stats(user):
@@ -100,28 +95,29 @@ class VotingService:
         """Cast a vote for a participant"""
         from django.utils import timezone
 
-        from ..models import ParticipantRole, Participation
+        from ..models import DebateStatus, ParticipantRole, Participation
 
-        # Validate vote
-        can_vote, message = VotingService.can_user_vote(user, session)
-        if not can_vote:
-            raise ValueError(message)
+        # Check if session is in voting period
+        if session.status != DebateStatus.CLOSED:
+            raise ValueError("Voting is not currently active")
 
         # Validate voted_for_user is a participant
-        try:
-            Participation.objects.get(
-                user=voted_for_user, session=session, role=ParticipantRole.PARTICIPANT
-            )
-        except Participation.DoesNotExist:
+        if not Participation.objects.filter(
+            user=voted_for_user, session=session, role=ParticipantRole.PARTICIPANT
+        ).exists():
             raise ValueError("Can only vote for active participants")
 
-        # Cast vote
-        voter_participation = Participation.objects.get(user=user, session=session)
-        voter_participation.has_voted = True
-        voter_participation.voted_for = voted_for_user
-        voter_participation.vote_timestamp = timezone.now()
-        voter_participation.save(
-            update_fields=["has_voted", "voted_for", "vote_timestamp"]
+        # Cast vote in a single conditional UPDATE so concurrent ballots
+        # from the same viewer cannot both be recorded
+        updated = Participation.objects.filter(
+            user=user, session=session, role=ParticipantRole.VIEWER, has_voted=False
+        ).update(
+            has_voted=True, voted_for=voted_for_user, vote_timestamp=timezone.now()
         )
 
+        if not updated:
+            # Work out why the voter was rejected
+            can_vote, message = VotingService.can_user_vote(user, session)
+            raise ValueError(message if not can_vote else "You have already voted")
+
         return True
@@ -7,60 +7,93 @@ Provides real-time broadcasting functionality for:
 - Session status changes
 """
 
+import asyncio
 import json
 import logging
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.utils import timezone
+
+from .session_status import get_session_status
 
 logger = logging.getLogger(__name__)
 
 
-def broadcast_vote_update(session, vote):
+def has_live_viewers(session_id):
     """
-    Broadcast voting update to all participants in a debate session.
+    Check whether anyone is connected to a session's debate room.
+
+    DebateConsumer keeps the users connected to each room in the cache. A
+    missing entry means presence is unknown, so only a known-empty list
+    counts as having no viewers.
+    """
+    return cache.get(f"debate_participants_{session_id}") != []
+
+
+async def _send_to_groups(channel_layer, groups, event):
+    """Send the same event to each channel group concurrently."""
+    await asyncio.gather(*(channel_layer.group_send(group, event) for group in groups))
+
+
+def _publish(groups, handler, message_data):
+    """
+    Encode a message once and send it to each of the given channel groups.
 
     Args:
-        session: DebateSession instance
-        vote: Vote instance that was just cast
+        groups: Names of the channel groups to send to
+        handler: Consumer method that delivers the message
+        message_data: JSON-serializable message for the clients
+
+    Returns:
+        bool: True if the message was handed to the channel layer
     """
     try:
         channel_layer = get_channel_layer()
         if not channel_layer:
             logger.warning("No channel layer configured for WebSocket broadcasting")
-            return
-
-        # Get vote statistics
-        from ..models import Vote
-
-        votes = Vote.objects.filter(debate_session=session)
-        best_argument_votes = votes.filter(vote_type="BEST_ARGUMENT").count()
-        winning_side_votes = votes.filter(vote_type="WINNING_SIDE").count()
-
-        message_data = {
-            "type": "vote_update",
-            "data": {
-                "session_id": session.id,
-                "best_argument_votes": best_argument_votes,
-                "winning_side_votes": winning_side_votes,
-                "total_votes": votes.count(),
-                "new_vote": {
-                    "user": vote.user.username,
-                    "vote_type": vote.vote_type,
-                    "timestamp": vote.created_at.isoformat(),
-                },
-            },
-        }
-
-        # Broadcast to session group
-        async_to_sync(channel_layer.group_send)(
-            f"debate_session_{session.id}",
-            {"type": "send_update", "message": json.dumps(message_data)},
-        )
+            return False
 
-        logger.info(f"Vote update broadcasted for session {session.id}")
+        # Encode once; the channel layer passes the text through unchanged
+        event = {"type": handler, "message": json.dumps(message_data)}
+        async_to_sync(_send_to_groups)(channel_layer, groups, event)
+        return True
 
     except Exception as e:
-        logger.error(f"Error broadcasting vote update: {str(e)}")
+        logger.error(f"Error broadcasting {message_data['type']}: {str(e)}")
+        return False
+
+
+def broadcast_vote_update(session, vote):
+    """
+    Broadcast voting update to all participants in a debate session.
+
+    Args:
+        session: DebateSession instance with up-to-date vote counts
+        vote: Vote instance that was just cast
+    """
+    if not has_live_viewers(session.id):
+        logger.debug(f"No live viewers in session {session.id}, vote not sent")
+        return
+
+    message_data = {
+        "type": "vote_update",
+        "data": {
+            "session_id": session.id,
+            "best_argument_votes": session.best_argument_vote_count,
+            "winning_side_votes": session.winning_side_vote_count,
+            "total_votes": session.best_argument_vote_count
+            + session.winning_side_vote_count,
+            "new_vote": {
+                "user": vote.user.username,
+                "vote_type": vote.vote_type,
+                "timestamp": vote.created_at.isoformat(),
+            },
+        },
+    }
+
+    if _publish([f"debate_session_{session.id}"], "send_update", message_data):
+        logger.info(f"Vote update broadcasted for session {session.id}")
 
 
 def broadcast_notification(user_ids, notification_data):
@@ -71,26 +104,13 @@ def broadcast_notification(user_ids, notification_data):
         user_ids: List of user IDs to notify
         notification_data: Dictionary containing notification information
     """
-    try:
-        channel_layer = get_channel_layer()
-        if not channel_layer:
-            logger.warning("No channel layer configured for notification broadcasting")
-            return
-
-        message_data = {"type": "notification", "data": notification_data}
-
-        # Send to each user's personal channel
-        for user_id in user_ids:
-            async_to_sync(channel_layer.group_send)(
-                f"user_{user_id}",
-                {"type": "send_notification", "message": json.dumps(message_data)},
-            )
+    message_data = {"type": "notification", "data": notification_data}
 
+    # Every user's personal channel is sent to concurrently in one event loop
+    groups = [f"user_{user_id}" for user_id in user_ids]
+    if _publish(groups, "send_notification", message_data):
         logger.info(f"Notification broadcasted to {len(user_ids)} users")
 
-    except Exception as e:
-        logger.error(f"Error broadcasting notification: {str(e)}")
-
 
 def broadcast_session_update(session, update_type, data=None):
     """
@@ -101,29 +121,98 @@ def broadcast_session_update(session, update_type, data=None):
         update_type: Type of update (status_change, participant_joined, etc.)
         data: Additional data to include in the broadcast
     """
-    try:
-        channel_layer = get_channel_layer()
-        if not channel_layer:
-            logger.warning("No channel layer configured for session broadcasting")
-            return
-
-        message_data = {
-            "type": "session_update",
-            "update_type": update_type,
-            "session_id": session.id,
-            "session_status": session.status,
-            "data": data or {},
-        }
-
-        # Broadcast to session group
-        async_to_sync(channel_layer.group_send)(
-            f"debate_session_{session.id}",
-            {"type": "send_update", "message": json.dumps(message_data)},
-        )
-
+    if not has_live_viewers(session.id):
+        logger.debug(f"No live viewers in session {session.id}, update not sent")
+        return
+
+    message_data = {
+        "type": "session_update",
+        "update_type": update_type,
+        "session_id": session.id,
+        "session_status": session.status,
+        "data": data or {},
+    }
+
+    if _publish([f"debate_session_{session.id}"], "send_update", message_data):
         logger.info(
             f"Session update broadcasted for session {session.id}: {update_type}"
         )
 
-    except Exception as e:
-        logger.error(f"Error broadcasting session update: {str(e)}")
+
+def broadcast_session_status(session, event_type, extra_data=None):
+    """
+    Broadcast a session status change to the session's debate room.
+
+    Args:
+        session: DebateSession instance in its new status
+        event_type: Type of event being broadcast (debate_started, etc.)
+        extra_data: Optional additional data to include in the broadcast
+    """
+    channel_layer = get_channel_layer()
+    if not channel_layer:
+        return
+
+    # Prepare base message data
+    data = {
+        "type": "session_status_update",
+        "event_type": event_type,
+        "session_status": session.status,
+        "timestamp": timezone.now().isoformat(),
+        # Full phase status, so clients need not poll the status endpoint
+        "status": get_session_status(session.id),
+    }
+
+    # Add any extra data provided
+    if extra_data:
+        data.update(extra_data)
+
+    # Add status-specific timing information
+    if session.status == "open":
+        data["joining_window_end"] = (
+            session.joining_window_end.isoformat()
+            if session.joining_window_end
+            else None
+        )
+    elif session.status == "online":
+        data["debate_end_time"] = (
+            session.debate_end_time.isoformat() if session.debate_end_time else None
+        )
+    elif session.status == "voting":
+        data["voting_end_time"] = (
+            session.voting_end_time.isoformat() if session.voting_end_time else None
+        )
+    elif session.status == "finished":
+        data.update(
+            {
+                "winner": (
+                    session.winner_participant.username
+                    if session.winner_participant
+                    else None
+                ),
+                "total_votes": session.total_votes,
+            }
+        )
+
+    # Broadcast to session group
+    async_to_sync(channel_layer.group_send)(f"debate_{session.id}", data)
+
+
+def broadcast_user_vote(user_id, session_id, vote_type):
+    """
+    Tell a voter that their vote was recorded.
+
+    Sent to the voter's notification channel so their clients can update
+    without polling the vote status endpoint.
+
+    Args:
+        user_id: ID of the voting user
+        session_id: ID of the DebateSession voted in
+        vote_type: BEST_ARGUMENT or WINNING_SIDE
+    """
+    message_data = {
+        "type": "user_vote",
+        "session_id": session_id,
+        "has_voted": True,
+        "vote_type": vote_type,
+    }
+    _publish([f"notifications_{user_id}"], "user_vote", message_data)
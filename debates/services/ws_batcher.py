@@ -0,0 +1,107 @@
+"""
+Coalescing WebSocket publisher for moderation broadcasts.
+
+Moderation endpoints run in sync request workers, where sending each event
+to the channel layer inline blocks the request on a layer round trip. Events
+are instead queued for a background event loop that sends them per group,
+every FLUSH_INTERVAL seconds or FLUSH_MAX_EVENTS events, as a single
+"moderation_action_batch" event that DebateConsumer unpacks.
+"""
+
+import asyncio
+import logging
+import threading
+
+from channels.layers import get_channel_layer
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = 0.05
+FLUSH_MAX_EVENTS = 50
+
+_loop = None
+_events = None
+_start_lock = threading.Lock()
+
+
+def enqueue_broadcast(group, event):
+    """
+    Queue a channel layer event for the next batched send to its group.
+
+    Args:
+        group: Name of the channel group to send to
+        event: Channel layer event, including its "type" handler
+    """
+    _ensure_started()
+    _loop.call_soon_threadsafe(_events.put_nowait, (group, event))
+
+
+def _ensure_started():
+    """Start the flushing event loop in a daemon thread on first use."""
+    global _loop, _events
+
+    if _loop is not None:
+        return
+
+    with _start_lock:
+        if _loop is not None:
+            return
+        loop = asyncio.new_event_loop()
+        events = asyncio.Queue()
+        threading.Thread(
+            target=loop.run_until_complete,
+            args=(_flush_forever(events),),
+            name="ws-batcher",
+            daemon=True,
+        ).start()
+        _events = events
+        _loop = loop
+
+
+async def _flush_forever(events):
+    """Collect queued events into batches and send them until the process exits."""
+    loop = asyncio.get_running_loop()
+    channel_layer = get_channel_layer()
+
+    while True:
+        batch = [await events.get()]
+        deadline = loop.time() + FLUSH_INTERVAL
+        while len(batch) < FLUSH_MAX_EVENTS:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(events.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        if channel_layer is None:
+            logger.warning(f"No channel layer configured, dropped {len(batch)} events")
+            continue
+
+        await _send_batch(channel_layer, batch)
+        # Let queued producers' callbacks run between flushes
+        await asyncio.sleep(0)
+
+
+async def _send_batch(channel_layer, batch):
+    """Send each group its events in order, one group_send per group."""
+    by_group = {}
+    for group, event in batch:
+        by_group.setdefault(group, []).append(event)
+
+    sends = []
+    for group, events in by_group.items():
+        if len(events) == 1:
+            sends.append(channel_layer.group_send(group, events[0]))
+        else:
+            sends.append(
+                channel_layer.group_send(
+                    group, {"type": "moderation_action_batch", "events": events}
+                )
+            )
+
+    results = await asyncio.gather(*sends, return_exceptions=True)
+    for group, result in zip(by_group, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error broadcasting to {group}: {result}")
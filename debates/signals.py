@@ -0,0 +1,83 @@
+"""
+Signal handlers for the debates app.
+
+Keeps cached session listings and the running counts on each session in
+sync with session, participation and message changes, and removes a
+session's votes along with it.
+"""
+
+from django.core.cache import cache
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .models import DebateSession, Message, Participation, Vote
+from .services.optimized_views import invalidate_session_list_cache
+from .services.performance_optimizations import invalidate_session_cache
+from .services.session_status import countdown_cache_key, status_cache_key
+
+
+@receiver(pre_delete, sender=DebateSession)
+def delete_session_votes(sender, instance, **kwargs):
+    """
+    Remove a session's votes with one bulk DELETE before the session goes.
+
+    Votes use DO_NOTHING on their session foreign key to skip the ORM's
+    per-row cascade. pre_delete fires for every way a session is deleted,
+    including topic cascades and queryset deletes.
+    """
+    Vote.objects.filter(debate_session=instance).delete()
+
+
+@receiver(post_save, sender=DebateSession)
+@receiver(post_delete, sender=DebateSession)
+@receiver(post_save, sender=Participation)
+@receiver(post_delete, sender=Participation)
+def invalidate_cached_session_lists(sender, **kwargs):
+    """Drop cached session lists whenever a session or its participants change."""
+    invalidate_session_list_cache()
+
+
+@receiver(post_save, sender=DebateSession)
+@receiver(post_delete, sender=DebateSession)
+def invalidate_cached_session_data(sender, instance, **kwargs):
+    """Evict the session's statistics, countdown and status, and the active session and topic lists."""
+    invalidate_session_cache(instance.pk)
+    # Phase transitions must show up in the next countdown and status poll
+    cache.delete_many([countdown_cache_key(instance.pk), status_cache_key(instance.pk)])
+
+
+@receiver(post_save, sender=Participation)
+@receiver(post_delete, sender=Participation)
+def update_session_participant_counts(sender, instance, **kwargs):
+    """Recount the session's participants and viewers when a role may have changed."""
+    update_fields = kwargs.get("update_fields")
+    if update_fields is not None and "role" not in update_fields:
+        return
+    # Connected before the status eviction below, so a status rebuilt right
+    # after it already sees the new counts
+    DebateSession.recount_participants(instance.session_id)
+
+
+@receiver(post_save, sender=Message)
+def count_new_message(sender, instance, created, **kwargs):
+    """Add a newly posted message to its session's message count."""
+    if created:
+        DebateSession.objects.filter(pk=instance.session_id).update(
+            message_count=F("message_count") + 1
+        )
+
+
+@receiver(post_delete, sender=Message)
+def uncount_deleted_message(sender, instance, **kwargs):
+    """Take a deleted message off its session's message count."""
+    DebateSession.objects.filter(pk=instance.session_id, message_count__gt=0).update(
+        message_count=F("message_count") - 1
+    )
+
+
+@receiver(post_save, sender=Participation)
+@receiver(post_delete, sender=Participation)
+def invalidate_cached_session_status(sender, instance, **kwargs):
+    """Evict the session's status, whose participant counts just changed."""
+    cache.delete(status_cache_key(instance.session_id))
@@ -3,43 +3,124 @@ Tests for debates app.
 
 This module contains comprehensive tests for debate topics, sessions,
 messages, voting, and moderation functionality.
+
+The tests are meant to run with onlineDebatePlatform.test_settings (the
+pytest configuration and run_tests.py select it), which swaps in the fast
+MD5 password hasher so creating test users stays cheap.
 """
 
+from importlib import import_module
+from io import StringIO
+from unittest import mock
+
+from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import IntegrityError, connection
+from django.test import override_settings
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework import status
-from rest_framework.test import APITestCase
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework.test import (
+    APIClient,
+    APIRequestFactory,
+    APITestCase,
+    force_authenticate,
+)
+from rest_framework_simplejwt.tokens import AccessToken
+from notifications.models import Notification
 
 from .models import DebateTopic, DebateSession, Message, Participation, Vote
+from .serializers import SESSION_MESSAGE_LIMIT
+from .services.notification_service import notification_service
+from .services.session_status import compute_status
+from .services.vote_buffer import buffer_vote, flush_votes
+from .views.vote_views import VoteSubmissionViewSet
 
 User = get_user_model()
 
 
-class DebateTopicTestCase(APITestCase):
-    """Test debate topic functionality."""
+class DebateFixturesMixin:
+    """
+    Users, bearer tokens and factories shared by the debates API tests.
 
-    def setUp(self):
-        """Set up test data."""
-        self.student = User.objects.create_user(
+    The rows are created once per class in setUpTestData; subclasses extend
+    it with super().setUpTestData() and add only what is specific to them.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create the student and moderator users and sign their tokens."""
+        super().setUpTestData()
+        cls.student = User.objects.create_user(
             username="student",
             email="student@example.com",
             password="testpass123",
             role="student",
         )
-        self.moderator = User.objects.create_user(
+        cls.moderator = User.objects.create_user(
             username="moderator",
             email="moderator@example.com",
             password="testpass123",
             role="moderator",
         )
 
-        self.student_token = RefreshToken.for_user(self.student).access_token
-        self.moderator_token = RefreshToken.for_user(self.moderator).access_token
+        # Signed once per class; the users are the same for every test
+        cls.student_token = str(AccessToken.for_user(cls.student))
+        cls.moderator_token = str(AccessToken.for_user(cls.moderator))
+
+        # Start time for scheduled sessions, computed once per class
+        cls.future = timezone.now() + timezone.timedelta(hours=1)
+
+    @classmethod
+    def setUpClass(cls):
+        """Build one pre-authenticated API client per role for the class."""
+        super().setUpClass()
+        # Created after setUpTestData so the clients are shared as-is rather
+        # than deep-copied into every test
+        cls.student_client = cls.authenticated_client(cls.student_token)
+        cls.moderator_client = cls.authenticated_client(cls.moderator_token)
+
+    @staticmethod
+    def authenticated_client(token):
+        """Return an APIClient that sends ``token`` as its bearer credentials."""
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        return client
+
+    @classmethod
+    def create_topic(cls):
+        """Create a debate topic owned by the moderator."""
+        return DebateTopic.objects.create(
+            title="Test Topic",
+            description="Test Description",
+            category="Test",
+            created_by=cls.moderator,
+        )
 
-        self.topics_url = reverse("topic-list")
+    @classmethod
+    def create_session(cls, status):
+        """Create a session on ``cls.topic`` scheduled to start in an hour."""
+        return DebateSession.objects.create(
+            topic=cls.topic,
+            moderator=cls.moderator,
+            scheduled_start=cls.future,
+            duration_minutes=60,
+            status=status,
+        )
+
+
+class DebateTopicTestCase(DebateFixturesMixin, APITestCase):
+    """Test debate topic functionality."""
 
+    @classmethod
+    def setUpTestData(cls):
+        """Resolve the endpoint shared by every test in the class."""
+        super().setUpTestData()
+        cls.topics_url = reverse("topic-list")
+
+    def setUp(self):
+        """Set up test data."""
         self.topic_data = {
             "title": "Should AI replace human teachers?",
             "description": "A debate about the role of AI in education",
@@ -48,23 +129,13 @@ class DebateTopicTestCase(APITestCase):
 
     def test_create_topic_as_moderator(self):
         """Test creating topic as moderator."""
-        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.moderator_token}")
-
-        response = self.client.post(self.topics_url, self.topic_data)
+        response = self.moderator_client.post(self.topics_url, self.topic_data)
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertTrue(
             DebateTopic.objects.filter(title=self.topic_data["title"]).exists()
         )
 
-    def test_create_topic_as_student_forbidden(self):
-        """Test creating topic as student should be forbidden."""
-        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.student_token}")
-
-        response = self.client.post(self.topics_url, self.topic_data)
-
-        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
-
     def test_create_topic_unauthenticated(self):
         """Test creating topic without authentication."""
         response = self.client.post(self.topics_url, self.topic_data)
@@ -110,8 +181,6 @@ class DebateTopicTestCase(APITestCase):
             created_by=self.moderator,
         )
 
-        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.moderator_token}")
-
         updated_data = {
             "title": "Updated Topic",
             "description": "Updated Description",
@@ -119,7 +188,7 @@ class DebateTopicTestCase(APITestCase):
         }
 
         url = reverse("topic-detail", kwargs={"pk": topic.pk})
-        response = self.client.put(url, updated_data)
+        response = self.moderator_client.put(url, updated_data)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         topic.refresh_from_db()
@@ -134,76 +203,44 @@ class DebateTopicTestCase(APITestCase):
             created_by=self.moderator,
         )
 
-        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.moderator_token}")
-
         url = reverse("topic-detail", kwargs={"pk": topic.pk})
-        response = self.client.delete(url)
+        response = self.moderator_client.delete(url)
 
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertFalse(DebateTopic.objects.filter(pk=topic.pk).exists())
 
 
-class DebateSessionTestCase(APITestCase):
+class DebateSessionTestCase(DebateFixturesMixin, APITestCase):
     """Test debate session functionality."""
 
+    @classmethod
+    def setUpTestData(cls):
+        """Create the debate rows shared by every test in the class."""
+        super().setUpTestData()
+        cls.topic = cls.create_topic()
+        cls.sessions_url = reverse("session-list")
+
     def setUp(self):
         """Set up test data."""
-        self.student = User.objects.create_user(
-            username="student",
-            email="student@example.com",
-            password="testpass123",
-            role="student",
-        )
-        self.moderator = User.objects.create_user(
-            username="moderator",
-            email="moderator@example.com",
-            password="testpass123",
-            role="moderator",
-        )
-
-        self.student_token = RefreshToken.for_user(self.student).access_token
-        self.moderator_token = RefreshToken.for_user(self.moderator).access_token
-
-        self.topic = DebateTopic.objects.create(
-            title="Test Topic",
-            description="Test Description",
-            category="Test",
-            created_by=self.moderator,
-        )
-
-        self.sessions_url = reverse("session-list")
-
         self.session_data = {
             "topic": self.topic.pk,
-            "scheduled_start": (
-                timezone.now() + timezone.timedelta(hours=1)
-            ).isoformat(),
+            "scheduled_start": self.future.isoformat(),
             "duration_minutes": 60,
         }
 
     def test_create_session_as_moderator(self):
         """Test creating session as moderator."""
-        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.moderator_token}")
-
-        response = self.client.post(self.sessions_url, self.session_data)
+        response = self.moderator_client.post(self.sessions_url, self.session_data)
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertTrue(DebateSession.objects.filter(topic=self.topic).exists())
 
-    def test_create_session_as_student_forbidden(self):
-        """Test creating session as student should be forbidden."""
-        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.student_token}")
-
-        response = self.client.post(self.sessions_url, self.session_data)
-
-        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
-
     def test_list_sessions_public(self):
         """Test listing sessions should be public."""
         session = DebateSession.objects.create(
             topic=self.topic,
             moderator=self.moderator,
-            scheduled_start=timezone.now() + timezone.timedelta(hours=1),
+            scheduled_start=self.future,
             duration_minutes=60,
         )
 
@@ -212,22 +249,33 @@ class DebateSessionTestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data["results"]), 1)
 
+    def test_session_detail_caps_messages(self):
+        """Test session detail nests only the most recent messages."""
+        session = self.create_session(status="online")
+        Message.objects.bulk_create(
+            Message(session=session, user=self.student, content=f"Message {i}")
+            for i in range(SESSION_MESSAGE_LIMIT + 5)
+        )
+
+        response = self.client.get(reverse("session-detail", kwargs={"pk": session.pk}))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["messages"]), SESSION_MESSAGE_LIMIT)
+
     def test_join_session_as_participant(self):
         """Test joining session as participant."""
         session = DebateSession.objects.create(
             topic=self.topic,
             moderator=self.moderator,
-            scheduled_start=timezone.now() + timezone.timedelta(hours=1),
+            scheduled_start=self.future,
             duration_minutes=60,
             status="joining",
         )
 
-        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.student_token}")
-
         url = reverse("session-join", kwargs={"pk": session.pk})
         join_data = {"role": "participant", "side": "proposition"}
 
-        response = self.client.post(url, join_data)
+        response = self.student_client.post(url, join_data)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertTrue(
@@ -241,17 +289,15 @@ class DebateSessionTestCase(APITestCase):
         session = DebateSession.objects.create(
             topic=self.topic,
             moderator=self.moderator,
-            scheduled_start=timezone.now() + timezone.timedelta(hours=1),
+            scheduled_start=self.future,
             duration_minutes=60,
             status="online",
         )
 
-        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.student_token}")
-
         url = reverse("session-join", kwargs={"pk": session.pk})
         join_data = {"role": "viewer"}
 
-        response = self.client.post(url, join_data)
+        response = self.student_client.post(url, join_data)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertTrue(
@@ -265,7 +311,7 @@ class DebateSessionTestCase(APITestCase):
         session = DebateSession.objects.create(
             topic=self.topic,
             moderator=self.moderator,
-            scheduled_start=timezone.now() + timezone.timedelta(hours=1),
+            scheduled_start=self.future,
             duration_minutes=60,
             status="online",
         )
@@ -273,10 +319,8 @@ class DebateSessionTestCase(APITestCase):
         # First join the session
         Participation.objects.create(session=session, user=self.student, role="viewer")
 
-        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.student_token}")
-
         url = reverse("session-leave", kwargs={"pk": session.pk})
-        response = self.client.post(url)
+        response = self.student_client.post(url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         # Participation should be marked as left, not deleted
@@ -288,7 +332,7 @@ class DebateSessionTestCase(APITestCase):
         session = DebateSession.objects.create(
             topic=self.topic,
             moderator=self.moderator,
-            scheduled_start=timezone.now() + timezone.timedelta(hours=1),
+            scheduled_start=self.future,
             duration_minutes=60,
             status="online",
         )
@@ -302,63 +346,34 @@ class DebateSessionTestCase(APITestCase):
         self.assertIn("viewer_count", response.data)
 
 
-class MessageTestCase(APITestCase):
-    """Test message functionality."""
+class MessageTestCase(DebateFixturesMixin, APITestCase):
+    """Test sending messages to a session."""
 
-    def setUp(self):
-        """Set up test data."""
-        self.student = User.objects.create_user(
-            username="student",
-            email="student@example.com",
-            password="testpass123",
-            role="student",
-        )
-        self.moderator = User.objects.create_user(
-            username="moderator",
-            email="moderator@example.com",
-            password="testpass123",
-            role="moderator",
-        )
-
-        self.student_token = RefreshToken.for_user(self.student).access_token
-        self.moderator_token = RefreshToken.for_user(self.moderator).access_token
-
-        self.topic = DebateTopic.objects.create(
-            title="Test Topic",
-            description="Test Description",
-            category="Test",
-            created_by=self.moderator,
-        )
-
-        self.session = DebateSession.objects.create(
-            topic=self.topic,
-            moderator=self.moderator,
-            scheduled_start=timezone.now() + timezone.timedelta(hours=1),
-            duration_minutes=60,
-            status="online",
-        )
+    @classmethod
+    def setUpTestData(cls):
+        """Create the debate rows shared by every test in the class."""
+        super().setUpTestData()
+        cls.topic = cls.create_topic()
+        cls.session = cls.create_session(status="online")
 
         # Add student as participant
         Participation.objects.create(
-            session=self.session,
-            user=self.student,
+            session=cls.session,
+            user=cls.student,
             role="participant",
             side="proposition",
         )
-
-        self.messages_url = reverse("message-list")
+        cls.messages_url = reverse("message-list")
 
     def test_send_message_as_participant(self):
         """Test sending message as participant."""
-        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.student_token}")
-
         message_data = {
             "session": self.session.pk,
             "content": "This is my argument for the proposition.",
             "message_type": "argument",
         }
 
-        response = self.client.post(self.messages_url, message_data)
+        response = self.student_client.post(self.messages_url, message_data)
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertTrue(
@@ -378,7 +393,7 @@ class MessageTestCase(APITestCase):
             role="student",
         )
 
-        token = RefreshToken.for_user(non_participant).access_token
+        token = AccessToken.for_user(non_participant)
         self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
 
         message_data = {
@@ -391,92 +406,90 @@ class MessageTestCase(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
+
+class MessageReadTestCase(DebateFixturesMixin, APITestCase):
+    """Test reading messages from a session seeded once for the class."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create a session with messages shared by the read-only tests."""
+        super().setUpTestData()
+        cls.topic = cls.create_topic()
+        cls.session = cls.create_session(status="online")
+        cls.messages_url = reverse("message-list")
+
+        cls.seed_messages = Message.objects.bulk_create(
+            [
+                Message(
+                    session=cls.session,
+                    user=cls.student,
+                    content="Test message 1",
+                    message_type="argument",
+                ),
+                Message(
+                    session=cls.session,
+                    user=cls.moderator,
+                    content="Test message 2",
+                    message_type="question",
+                ),
+            ]
+        )
+
     def test_get_session_messages(self):
         """Test retrieving session messages."""
-        # Create some messages
-        Message.objects.create(
-            session=self.session,
-            author=self.student,
-            content="Test message 1",
-            message_type="argument",
+        response = self.student_client.get(
+            f"{self.messages_url}?session_pk={self.session.pk}"
         )
-        Message.objects.create(
-            session=self.session,
-            author=self.moderator,
-            content="Test message 2",
-            message_type="question",
-        )
-
-        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.student_token}")
-
-        response = self.client.get(f"{self.messages_url}?session_pk={self.session.pk}")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data["results"]), 2)
+        self.assertEqual(len(response.data["results"]), len(self.seed_messages))
 
 
-class VotingTestCase(APITestCase):
+class VotingTestCase(DebateFixturesMixin, APITestCase):
     """Test voting functionality."""
 
-    def setUp(self):
-        """Set up test data."""
-        self.student = User.objects.create_user(
-            username="student",
-            email="student@example.com",
-            password="testpass123",
-            role="student",
-        )
-        self.viewer = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        """Create the debate rows shared by every test in the class."""
+        super().setUpTestData()
+        cls.viewer = User.objects.create_user(
             username="viewer",
             email="viewer@example.com",
             password="testpass123",
             role="student",
         )
-        self.moderator = User.objects.create_user(
-            username="moderator",
-            email="moderator@example.com",
-            password="testpass123",
-            role="moderator",
-        )
+        cls.viewer_token = str(AccessToken.for_user(cls.viewer))
 
-        self.student_token = RefreshToken.for_user(self.student).access_token
-        self.viewer_token = RefreshToken.for_user(self.viewer).access_token
-        self.moderator_token = RefreshToken.for_user(self.moderator).access_token
-
-        self.topic = DebateTopic.objects.create(
-            title="Test Topic",
-            description="Test Description",
-            category="Test",
-            created_by=self.moderator,
-        )
-
-        self.session = DebateSession.objects.create(
-            topic=self.topic,
-            moderator=self.moderator,
-            scheduled_start=timezone.now() + timezone.timedelta(hours=1),
-            duration_minutes=60,
-            status="voting",
-        )
+        cls.topic = cls.create_topic()
+        cls.session = cls.create_session(status="voting")
 
         # Add users to session
-        Participation.objects.create(
-            session=self.session,
-            user=self.student,
-            role="participant",
-            side="proposition",
-        )
-        Participation.objects.create(
-            session=self.session, user=self.viewer, role="viewer"
+        Participation.objects.bulk_create(
+            [
+                Participation(
+                    session=cls.session,
+                    user=cls.student,
+                    role="participant",
+                    side="proposition",
+                ),
+                Participation(session=cls.session, user=cls.viewer, role="viewer"),
+            ]
         )
+        # bulk_create skips the signals that keep the session's counts
+        DebateSession.recount_participants(cls.session.pk)
+
+    @classmethod
+    def setUpClass(cls):
+        """Add a pre-authenticated client for the viewer."""
+        super().setUpClass()
+        cls.viewer_client = cls.authenticated_client(cls.viewer_token)
 
     def test_submit_vote_as_viewer(self):
         """Test submitting vote as viewer."""
-        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.viewer_token}")
-
         vote_url = reverse("submit-vote", kwargs={"session_id": self.session.pk})
         vote_data = {"vote_type": "proposition"}
 
-        response = self.client.post(vote_url, vote_data)
+        response = self.viewer_client.post(vote_url, vote_data)
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertTrue(
@@ -487,12 +500,10 @@ class VotingTestCase(APITestCase):
 
     def test_submit_vote_as_participant_forbidden(self):
         """Test submitting vote as participant should be forbidden."""
-        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.student_token}")
-
         vote_url = reverse("submit-vote", kwargs={"session_id": self.session.pk})
         vote_data = {"vote_type": "proposition"}
 
-        response = self.client.post(vote_url, vote_data)
+        response = self.student_client.post(vote_url, vote_data)
 
         # Participants should not be able to vote
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -504,12 +515,10 @@ class VotingTestCase(APITestCase):
             debate_session=self.session, user=self.viewer, vote_type="proposition"
         )
 
-        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.viewer_token}")
-
         vote_url = reverse("submit-vote", kwargs={"session_id": self.session.pk})
         vote_data = {"vote_type": "opposition"}
 
-        response = self.client.post(vote_url, vote_data)
+        response = self.viewer_client.post(vote_url, vote_data)
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         # Should have only one vote record per user per session
@@ -532,73 +541,558 @@ class VotingTestCase(APITestCase):
         self.assertIn("opposition_votes", response.data)
         self.assertIn("total_votes", response.data)
 
+    def test_session_voting_results(self):
+        """Test the session's voting results tally sides and the user's vote."""
+        Vote.objects.create(
+            debate_session=self.session, user=self.viewer, vote_type="proposition"
+        )
+        url = reverse("session-voting-results", kwargs={"pk": self.session.pk})
+
+        response = self.viewer_client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["proposition"], 1)
+        self.assertEqual(response.data["opposition"], 0)
+        self.assertEqual(response.data["winner"], "proposition")
+        self.assertEqual(response.data["userVote"], "proposition")
+        self.assertEqual(
+            response.data["participants"]["proposition"],
+            [{"user__username": "student", "user__id": self.student.pk}],
+        )
+
+    def test_user_vote_status(self):
+        """Test the vote status reports the user's own ballot."""
+        Vote.objects.create(
+            debate_session=self.session, user=self.viewer, vote_type="opposition"
+        )
+        url = reverse("session-user-vote-status", kwargs={"pk": self.session.pk})
+
+        response = self.viewer_client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"has_voted": True, "vote": "opposition"})
+
+    def test_vote_submission_results(self):
+        """Test the vote submission results count each vote type."""
+        Vote.objects.create(
+            debate_session=self.session, user=self.viewer, vote_type="WINNING_SIDE"
+        )
+        view = VoteSubmissionViewSet.as_view({"get": "get_voting_results"})
+        request = APIRequestFactory().get("/votes/")
+        force_authenticate(request, user=self.viewer)
+
+        response = view(request, pk=self.session.pk)
+
+        self.assertEqual(
+            response.data,
+            {
+                "best_argument_votes": 0,
+                "winning_side_votes": 1,
+                "total_votes": 1,
+                "user_voted": True,
+            },
+        )
+
+    def test_session_analytics(self):
+        """Test the session analytics count participants and votes by side."""
+        Vote.objects.create(
+            debate_session=self.session, user=self.viewer, vote_type="opposition"
+        )
+        url = reverse("session-analytics", kwargs={"pk": self.session.pk})
+
+        response = self.moderator_client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["participants"]["total_participants"], 1)
+        self.assertEqual(response.data["participants"]["total_viewers"], 1)
+        self.assertEqual(
+            response.data["votes"],
+            {
+                "total_votes": 1,
+                "pro_votes": 0,
+                "con_votes": 1,
+                "participation_rate": 100.0,
+            },
+        )
+
     def test_vote_on_non_voting_session(self):
         """Test voting on session that's not in voting phase."""
         self.session.status = "online"
         self.session.save()
 
-        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.viewer_token}")
-
         vote_url = reverse("submit-vote", kwargs={"session_id": self.session.pk})
         vote_data = {"vote_type": "proposition"}
 
-        response = self.client.post(vote_url, vote_data)
+        response = self.viewer_client.post(vote_url, vote_data)
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
 
-class ModerationTestCase(APITestCase):
-    """Test moderation functionality."""
+class SessionStatusTestCase(DebateFixturesMixin, APITestCase):
+    """Test the phase-aware status payload."""
 
-    def setUp(self):
-        """Set up test data."""
-        self.student = User.objects.create_user(
-            username="student",
-            email="student@example.com",
+    @classmethod
+    def setUpTestData(cls):
+        """Create a topic for the sessions under test."""
+        super().setUpTestData()
+        cls.topic = cls.create_topic()
+
+    def test_closed_before_debate_start_is_set(self):
+        """Test a closed session without a debate start stays closed."""
+        session = self.create_session(status="closed")
+        now = timezone.now()
+        session.joining_started_at = now - timezone.timedelta(minutes=10)
+        session.joining_window_end = now - timezone.timedelta(minutes=5)
+
+        status_data = compute_status(session)
+
+        self.assertEqual(status_data["phase"], "closed")
+        self.assertIsNone(status_data["nextPhaseAt"])
+
+    def test_finished_session_is_ended(self):
+        """Test a finished session reports the ended phase."""
+        session = self.create_session(status="finished")
+        session.joining_started_at = timezone.now() - timezone.timedelta(hours=1)
+
+        self.assertEqual(compute_status(session)["phase"], "ended")
+
+
+class SideLimitTestCase(DebateFixturesMixin, APITestCase):
+    """Test the per-side participant limit on joining."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Fill the proposition side of an open session."""
+        super().setUpTestData()
+        cls.topic = cls.create_topic()
+        # No moderator, so joining sends no notification
+        cls.session = DebateSession.objects.create(
+            topic=cls.topic, duration_minutes=60, status="open"
+        )
+        debaters = User.objects.bulk_create(
+            User(username=f"debater{i}", email=f"debater{i}@example.com")
+            for i in range(10)
+        )
+        Participation.objects.bulk_create(
+            Participation(
+                session=cls.session, user=user, role="participant", side="proposition"
+            )
+            for user in debaters
+        )
+        cls.debater = debaters[0]
+        cls.url = reverse("session-join", kwargs={"pk": cls.session.pk})
+
+    def join(self, user):
+        client = self.authenticated_client(str(AccessToken.for_user(user)))
+        return client.post(self.url, {"role": "participant", "side": "proposition"})
+
+    def test_full_side_rejects_new_participant(self):
+        """Test an 11th participant on a side is refused."""
+        response = self.join(self.student)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(
+            Participation.objects.filter(
+                session=self.session, user=self.student
+            ).exists()
+        )
+
+    def test_participant_can_rejoin_full_side(self):
+        """Test a participant already on a full side may join it again."""
+        response = self.join(self.debater)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self.session.participation_set.filter(
+                role="participant", side="proposition"
+            ).count(),
+            10,
+        )
+
+
+class RunningCountsTestCase(DebateFixturesMixin, APITestCase):
+    """Test the participant, viewer and message counts kept on sessions."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create a topic and a second student."""
+        super().setUpTestData()
+        cls.topic = cls.create_topic()
+        cls.viewer = User.objects.create_user(
+            username="viewer",
+            email="viewer@example.com",
             password="testpass123",
             role="student",
         )
-        self.moderator = User.objects.create_user(
-            username="moderator",
-            email="moderator@example.com",
-            password="testpass123",
-            role="moderator",
+
+    def assert_counts(self, session, participants, viewers, messages):
+        session.refresh_from_db()
+        self.assertEqual(
+            (session.participant_count, session.viewer_count, session.message_count),
+            (participants, viewers, messages),
         )
 
-        self.student_token = RefreshToken.for_user(self.student).access_token
-        self.moderator_token = RefreshToken.for_user(self.moderator).access_token
+    def test_message_counts(self):
+        """Test posting and deleting messages updates the message count."""
+        session = self.create_session(status="online")
+        message = Message.objects.create(
+            session=session, user=self.student, content="First"
+        )
+        Message.objects.create(session=session, user=self.student, content="Second")
+        self.assert_counts(session, 0, 0, 2)
 
-        self.topic = DebateTopic.objects.create(
-            title="Test Topic",
-            description="Test Description",
-            category="Test",
-            created_by=self.moderator,
+        message.delete()
+
+        self.assert_counts(session, 0, 0, 1)
+
+    def test_participation_counts(self):
+        """Test joining, switching role and leaving update the role counts."""
+        session = self.create_session(status="open")
+        participation = Participation.objects.create(
+            session=session, user=self.student, role="participant", side="opposition"
         )
+        Participation.objects.create(session=session, user=self.viewer, role="viewer")
+        self.assert_counts(session, 1, 1, 0)
 
-        self.session = DebateSession.objects.create(
-            topic=self.topic,
-            moderator=self.moderator,
-            scheduled_start=timezone.now() + timezone.timedelta(hours=1),
-            duration_minutes=60,
-            status="online",
+        participation.role = "viewer"
+        participation.side = None
+        participation.save()
+        self.assert_counts(session, 0, 2, 0)
+
+        participation.delete()
+        self.assert_counts(session, 0, 1, 0)
+
+    def test_join_upsert_recounts(self):
+        """Test joining and rejoining through the upsert keeps counts right."""
+        # No moderator, so joining sends no notification
+        session = DebateSession.objects.create(
+            topic=self.topic, duration_minutes=60, status="open"
+        )
+        url = reverse("session-join", kwargs={"pk": session.pk})
+
+        response = self.student_client.post(
+            url, {"role": "participant", "side": "proposition"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assert_counts(session, 1, 0, 0)
+
+        DebateSession.objects.filter(pk=session.pk).update(status="closed")
+        response = self.student_client.post(url, {"role": "viewer"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assert_counts(session, 0, 1, 0)
+
+    def test_migration_backfills_counts(self):
+        """Test the count columns' migration seeds them from existing rows."""
+        session = self.create_session(status="online")
+        Participation.objects.create(
+            session=session, user=self.student, role="participant", side="opposition"
+        )
+        Participation.objects.create(session=session, user=self.viewer, role="viewer")
+        Message.objects.create(session=session, user=self.student, content="Hello")
+        DebateSession.objects.update(
+            participant_count=0, viewer_count=0, message_count=0
+        )
+
+        migration = import_module(
+            "debates.migrations.0024_debatesession_running_counts"
+        )
+        migration.backfill_running_counts(apps, None)
+
+        self.assert_counts(session, 1, 1, 1)
+
+
+class NotificationServiceTestCase(DebateFixturesMixin, APITestCase):
+    """Test the notification service's per-user queries."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Give the student one read and one unread notification."""
+        super().setUpTestData()
+        Notification.objects.bulk_create(
+            [
+                Notification(
+                    user=cls.student,
+                    title="Read",
+                    message="Seen",
+                    type="debate_started",
+                ),
+                Notification(
+                    user=cls.student,
+                    title="Unread",
+                    message="New",
+                    type="vote_reminder",
+                    is_read=False,
+                ),
+                Notification(
+                    user=cls.moderator,
+                    title="Other",
+                    message="Not theirs",
+                    type="debate_started",
+                ),
+            ]
+        )
+        Notification.objects.filter(title="Read").update(is_read=True)
+
+    def test_get_user_notifications(self):
+        """Test listing returns only the user's notifications."""
+        notifications = notification_service.get_user_notifications(self.student)
+        unread = notification_service.get_user_notifications(
+            self.student, unread_only=True
         )
 
+        self.assertEqual({n.title for n in notifications}, {"Read", "Unread"})
+        self.assertEqual([n.title for n in unread], ["Unread"])
+
+    def test_unread_count_and_mark_as_read(self):
+        """Test marking all as read clears the user's unread count."""
+        self.assertEqual(notification_service.get_unread_count(self.student), 1)
+
+        self.assertEqual(
+            notification_service.mark_notifications_as_read(self.student), 1
+        )
+
+        self.assertEqual(notification_service.get_unread_count(self.student), 0)
+        self.assertEqual(notification_service.get_unread_count(self.moderator), 1)
+
+
+class FakeRedis:
+    """In-memory stand-in for the few Redis commands the vote buffer uses."""
+
+    def __init__(self):
+        self.lists = {}
+        self.sets = {}
+
+    def pipeline(self, transaction=True):
+        return FakeRedisPipeline(self)
+
+    def sadd(self, key, *values):
+        members = self.sets.setdefault(key, set())
+        added = {str(value) for value in values} - members
+        members |= added
+        return len(added)
+
+    def srem(self, key, *values):
+        members = self.sets.get(key, set())
+        removed = {str(value) for value in values} & members
+        members -= removed
+        return len(removed)
+
+    def expire(self, key, seconds):
+        return True
+
+    def rpush(self, key, *values):
+        self.lists.setdefault(key, []).extend(values)
+        return len(self.lists[key])
+
+    def lrange(self, key, start, end):
+        return list(self.lists.get(key, []))
+
+    def delete(self, *keys):
+        return sum(
+            self.lists.pop(key, None) is not None
+            or self.sets.pop(key, None) is not None
+            for key in keys
+        )
+
+
+class FakeRedisPipeline:
+    """Queues FakeRedis commands and runs them on execute()."""
+
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args):
+            self.commands.append((getattr(self.client, name), args))
+
+        return queue
+
+    def execute(self):
+        return [command(*args) for command, args in self.commands]
+
+
+class VoteBufferTestCase(DebateFixturesMixin, APITestCase):
+    """Test buffered voting keeps to one vote per user."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create a session in its voting window."""
+        super().setUpTestData()
+        cls.topic = cls.create_topic()
+        cls.session = cls.create_session(status="voting")
+
+    def setUp(self):
+        self.redis = FakeRedis()
+        patcher = mock.patch(
+            "debates.services.vote_buffer.get_redis_client", return_value=self.redis
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_buffered_vote_is_flushed(self):
+        """Test a buffered vote is stored and counted on flush."""
+        self.assertTrue(buffer_vote(self.session.pk, self.student.pk, "WINNING_SIDE"))
+        self.assertFalse(Vote.objects.exists())
+
+        self.assertEqual(flush_votes(self.session.pk), 1)
+
+        self.assertTrue(
+            Vote.objects.filter(debate_session=self.session, user=self.student).exists()
+        )
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.winning_side_vote_count, 1)
+        self.assertEqual(self.redis.sets[f"vote_voters_{self.session.pk}"], set())
+
+    def test_second_buffered_ballot_rejected(self):
+        """Test a second ballot queued before the flush is refused."""
+        buffer_vote(self.session.pk, self.student.pk, "WINNING_SIDE")
+
+        with self.assertRaises(IntegrityError):
+            buffer_vote(self.session.pk, self.student.pk, "BEST_ARGUMENT")
+
+        flush_votes(self.session.pk)
+        vote = Vote.objects.get(debate_session=self.session, user=self.student)
+        self.assertEqual(vote.vote_type, "WINNING_SIDE")
+
+    def test_second_direct_ballot_rejected(self):
+        """Test a duplicate raises when Redis is unavailable too."""
+        with mock.patch(
+            "debates.services.vote_buffer.get_redis_client", return_value=None
+        ):
+            self.assertFalse(
+                buffer_vote(self.session.pk, self.student.pk, "WINNING_SIDE")
+            )
+            with self.assertRaises(IntegrityError):
+                buffer_vote(self.session.pk, self.student.pk, "BEST_ARGUMENT")
+
+        self.assertEqual(Vote.objects.filter(debate_session=self.session).count(), 1)
+
+    def test_flush_votes_command(self):
+        """Test the periodic flusher drains the buffer of voting sessions."""
+        buffer_vote(self.session.pk, self.student.pk, "WINNING_SIDE")
+
+        call_command("flush_votes", "--once", stdout=StringIO())
+
+        self.assertFalse(self.redis.lists.get(f"vote_buffer_{self.session.pk}"))
+        self.assertTrue(
+            Vote.objects.filter(debate_session=self.session, user=self.student).exists()
+        )
+
+    @override_settings(VOTE_BUFFER_ENABLED=True)
+    def test_submit_duplicate_buffered_vote(self):
+        """Test the vote endpoint answers a second buffered ballot with 400."""
+        view = VoteSubmissionViewSet.as_view({"post": "submit_vote"})
+
+        def submit(vote_type):
+            request = APIRequestFactory().post(
+                "/vote/", {"vote_type": vote_type}, format="json"
+            )
+            force_authenticate(request, user=self.student)
+            return view(request, pk=self.session.pk)
+
+        self.assertEqual(submit("WINNING_SIDE").status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(
+            submit("BEST_ARGUMENT").status_code, status.HTTP_400_BAD_REQUEST
+        )
+
+
+class ProcessSessionsTestCase(DebateFixturesMixin, APITestCase):
+    """Test the scheduled session transitions."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create a session whose voting window has expired."""
+        super().setUpTestData()
+        cls.topic = cls.create_topic()
+        cls.session = cls.create_session(status="voting")
+        cls.session.voting_end_time = timezone.now() - timezone.timedelta(seconds=1)
+        cls.session.save(update_fields=["voting_end_time"])
+        Participation.objects.create(
+            session=cls.session,
+            user=cls.student,
+            role="participant",
+            side="proposition",
+        )
+        voter = User.objects.create_user(
+            username="voter", email="voter@example.com", role="student"
+        )
+        Vote.objects.create(
+            debate_session=cls.session, user=voter, vote_type="proposition"
+        )
+
+    def test_expired_voting_session_is_finished(self):
+        """Test the command finishes an expired session and picks its winner."""
+        call_command("process_sessions", stdout=StringIO())
+
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.status, "finished")
+        self.assertEqual(self.session.total_votes, 1)
+        self.assertEqual(self.session.winner_participant, self.student)
+
+
+class SessionDeletionTestCase(DebateFixturesMixin, APITestCase):
+    """Test that votes go with their session however it is deleted."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create a voted-on session."""
+        super().setUpTestData()
+        cls.topic = cls.create_topic()
+        cls.session = cls.create_session(status="finished")
+        Vote.objects.create(
+            debate_session=cls.session, user=cls.student, vote_type="WINNING_SIDE"
+        )
+
+    def assert_votes_removed(self):
+        self.assertFalse(Vote.objects.exists())
+        # Votes don't cascade in the database, so orphans would fail here
+        connection.check_constraints()
+
+    def test_delete_session(self):
+        """Test deleting the session instance removes its votes."""
+        self.session.delete()
+
+        self.assert_votes_removed()
+
+    def test_delete_topic_with_voted_session(self):
+        """Test deleting the topic cascades to the session and its votes."""
+        self.topic.delete()
+
+        self.assertFalse(DebateSession.objects.exists())
+        self.assert_votes_removed()
+
+    def test_delete_session_queryset(self):
+        """Test a queryset delete removes the sessions' votes."""
+        DebateSession.objects.filter(pk=self.session.pk).delete()
+
+        self.assert_votes_removed()
+
+
+class ModerationTestCase(DebateFixturesMixin, APITestCase):
+    """Test moderation functionality."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create the debate rows shared by every test in the class."""
+        super().setUpTestData()
+        cls.topic = cls.create_topic()
+        cls.session = cls.create_session(status="online")
+
         # Add student as participant
-        self.participation = Participation.objects.create(
-            session=self.session,
-            user=self.student,
+        cls.participation = Participation.objects.create(
+            session=cls.session,
+            user=cls.student,
             role="participant",
             side="proposition",
         )
 
     def test_mute_participant_as_moderator(self):
         """Test muting participant as moderator."""
-        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.moderator_token}")
-
         url = reverse("session-mute-participant", kwargs={"pk": self.session.pk})
         mute_data = {"user_id": self.student.pk, "reason": "Inappropriate language"}
 
-        response = self.client.post(url, mute_data)
+        response = self.moderator_client.post(url, mute_data)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.participation.refresh_from_db()
@@ -606,25 +1100,68 @@ class ModerationTestCase(APITestCase):
 
     def test_mute_participant_as_student_forbidden(self):
         """Test muting participant as student should be forbidden."""
-        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.student_token}")
-
         url = reverse("session-mute-participant", kwargs={"pk": self.session.pk})
         mute_data = {"user_id": self.student.pk, "reason": "Should not work"}
 
-        response = self.client.post(url, mute_data)
+        response = self.student_client.post(url, mute_data)
 
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
     def test_remove_participant_as_moderator(self):
         """Test removing participant as moderator."""
-        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.moderator_token}")
-
         url = reverse("session-remove-participant", kwargs={"pk": self.session.pk})
         remove_data = {"user_id": self.student.pk, "reason": "Violation of rules"}
 
-        response = self.client.post(url, remove_data)
+        response = self.moderator_client.post(url, remove_data)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.participation.refresh_from_db()
         self.assertIsNotNone(self.participation.left_at)
         self.assertTrue(self.participation.was_removed)
+
+
+class StudentForbiddenTestCase(DebateFixturesMixin, APITestCase):
+    """Test that moderator-only creation endpoints are refused to a student."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create a voting session the student takes part in as a debater."""
+        super().setUpTestData()
+        cls.topic = cls.create_topic()
+        cls.session = cls.create_session(status="voting")
+        Participation.objects.create(
+            session=cls.session,
+            user=cls.student,
+            role="participant",
+            side="proposition",
+        )
+
+    def test_student_forbidden_actions(self):
+        """Test each moderator-only POST returns 403 for a participating student."""
+        cases = [
+            (
+                "topic-list",
+                {},
+                {
+                    "title": "Should AI replace human teachers?",
+                    "description": "A debate about the role of AI in education",
+                    "category": "Education",
+                },
+            ),
+            (
+                "session-list",
+                {},
+                {
+                    "topic": self.topic.pk,
+                    "scheduled_start": self.future.isoformat(),
+                    "duration_minutes": 60,
+                },
+            ),
+        ]
+
+        for url_name, kwargs, data in cases:
+            with self.subTest(url_name=url_name):
+                url = reverse(url_name, kwargs=kwargs)
+                response = self.student_client.post(url, data)
+
+                self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -5,13 +5,44 @@ This module provides API endpoints for managing debate messages,
 including message retrieval, filtering by session, and ordering by timestamp.
 """
 
-from rest_framework import viewsets
+from rest_framework import filters, viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import IsAuthenticated
 
 from ..models import Message
 from ..serializers import MessageSerializer
 
 
+class SessionFilterBackend(filters.BaseFilterBackend):
+    """
+    Restrict messages to one session via the ``?session_pk=`` parameter.
+
+    The filter runs in the database against the (session, timestamp) index.
+    Listing requires the parameter so a request can never scan every
+    message of every session.
+    """
+
+    query_param = "session_pk"
+
+    def filter_queryset(self, request, queryset, view):
+        session_pk = request.query_params.get(self.query_param)
+        if session_pk:
+            return queryset.filter(session_id=session_pk)
+        if view.action == "list":
+            raise ValidationError(
+                {self.query_param: "This query parameter is required."}
+            )
+        return queryset
+
+
+class MessagePagination(LimitOffsetPagination):
+    """Limit/offset pages of messages, 100 at a time unless asked otherwise"""
+
+    default_limit = 100
+    max_limit = 500
+
+
 class MessageViewSet(viewsets.ModelViewSet):
     """
     ViewSet for managing debate messages.
@@ -20,17 +51,12 @@ class MessageViewSet(viewsets.ModelViewSet):
     by session and chronological ordering.
     """
 
+    # The serializer renders each message's user; the session is only
+    # rendered as its primary key, so it needs no join
+    queryset = Message.objects.select_related("user")
     serializer_class = MessageSerializer
     permission_classes = [IsAuthenticated]
-
-    def get_queryset(self):
-        """
-        Filter messages by session or return all messages.
-
-        Returns:
-            QuerySet: Filtered message objects ordered by timestamp.
-        """
-        session_pk = self.request.query_params.get("session_pk")
-        if session_pk:
-            return Message.objects.filter(session_id=session_pk).order_by("timestamp")
-        return Message.objects.all()
+    pagination_class = MessagePagination
+    filter_backends = [SessionFilterBackend, filters.OrderingFilter]
+    ordering_fields = ["timestamp"]
+    ordering = ["timestamp"]
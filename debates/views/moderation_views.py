@@ -2,7 +2,7 @@
 Moderation action-related views for the debates app.
 """
 
-from django.utils import timezone
+from django.core.cache import cache
 from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
@@ -14,6 +14,13 @@ from ..serializers import (
     SessionTranscriptSerializer,
 )
 
+TRANSCRIPT_CACHE_TIMEOUT = 60 * 60
+
+
+def transcript_cache_key(session):
+    """Cache key for a serialized transcript, scoped to the session's last update."""
+    return f"session_transcript:{session.pk}:{session.updated_at.timestamp()}"
+
 
 class ModerationActionViewSet(viewsets.ModelViewSet):
     queryset = ModerationAction.objects.all()
@@ -24,22 +31,40 @@ class ModerationActionViewSet(viewsets.ModelViewSet):
         session_id = self.request.query_params.get("session")
         if session_id:
             queryset = queryset.filter(session_id=session_id)
+        if self.action in ("transcript", "generate_transcript"):
+            # Both actions work on the action's session, so join it up front
+            queryset = queryset.select_related("session")
         return queryset
 
     @action(detail=True, methods=["get"], permission_classes=[])
     def transcript(self, request, pk=None):
-        session = self.get_object()
-        transcript = SessionTranscript.objects.filter(session=session).first()
-        if not transcript:
-            return Response({"error": "Transcript not found"}, status=404)
-        serializer = SessionTranscriptSerializer(transcript)
-        return Response(serializer.data)
+        session = self.get_object().session
+        cache_key = transcript_cache_key(session)
+        data = cache.get(cache_key)
+
+        if data is None:
+            transcript = SessionTranscript.objects.filter(session=session).first()
+            if not transcript:
+                return Response({"error": "Transcript not found"}, status=404)
+            data = SessionTranscriptSerializer(transcript).data
+            cache.set(cache_key, data, TRANSCRIPT_CACHE_TIMEOUT)
+
+        return Response(data)
 
     @action(detail=True, methods=["post"], permission_classes=[IsAuthenticated])
     def generate_transcript(self, request, pk=None):
-        session = self.get_object()
-        # Dummy implementation: create or update transcript
-        transcript, _ = SessionTranscript.objects.get_or_create(session=session)
-        transcript.generated_at = timezone.now()
-        transcript.save()
-        return Response({"status": "Transcript generated", "id": transcript.id})
+        session = self.get_object().session
+        session_id = session.pk
+        # Dummy implementation: create or update transcript in one upsert
+        # (INSERT ... ON CONFLICT (session_id) DO UPDATE)
+        SessionTranscript.objects.bulk_create(
+            [SessionTranscript(session_id=session_id)],
+            update_conflicts=True,
+            unique_fields=["session"],
+            update_fields=["generated_at", "updated_at"],
+        )
+        transcript_id = SessionTranscript.objects.values_list("id", flat=True).get(
+            session_id=session_id
+        )
+        cache.delete(transcript_cache_key(session))
+        return Response({"status": "Transcript generated", "id": transcript_id})
@@ -3,17 +3,32 @@ User profile-related views for the debates app.
 """
 
 from rest_framework import viewsets
+from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import IsAuthenticated
 
+from users.serializers import UserSerializer
+
 from ..models import UserProfile
 from ..serializers import UserProfileSerializer
 
 
+class UserProfilePagination(LimitOffsetPagination):
+    """Limit/offset pages of profiles, 50 at a time unless asked otherwise"""
+
+    default_limit = 50
+    max_limit = 200
+
+
 class UserProfileViewSet(viewsets.ModelViewSet):
     """ViewSet for managing user profiles"""
 
     serializer_class = UserProfileSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = UserProfilePagination
 
     def get_queryset(self):
-        return UserProfile.objects.all()
+        # Load only the profile and user columns the serializers render
+        return UserProfile.objects.select_related("user").only(
+            *(field for field in UserProfileSerializer.Meta.fields if field != "user"),
+            *(f"user__{field}" for field in UserSerializer.Meta.fields),
+        )
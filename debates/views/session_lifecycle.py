@@ -6,32 +6,136 @@ These handle the various phases of a debate session.
 from datetime import timedelta
 
 from core.permissions import IsSessionModerator
+from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.http import JsonResponse
 from django.utils import timezone
+from django.utils.cache import patch_cache_control
 from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from ..services.background import run_in_background
 from ..services.notification_service import notification_service
+from ..services.session_status import countdown_cache_key
+
+JOINING_WINDOW = timedelta(minutes=5)
+DEBATE_START_DELAY = timedelta(minutes=2)
+VOTING_WINDOW = timedelta(seconds=30)
+
+# Clients poll the countdown every second; one cached payload serves them all
+COUNTDOWN_CACHE_TIMEOUT = 1
+
+
+def _set_open(session, now):
+    session.joining_started_at = now
+    changed = ["joining_started_at"]
+    if not session.joining_window_end:
+        session.joining_window_end = now + JOINING_WINDOW
+        changed.append("joining_window_end")
+    return changed
+
+
+def _set_closed(session, now):
+    session.joining_window_end = now
+    changed = ["joining_window_end"]
+    if not session.debate_started_at:
+        session.debate_started_at = now + DEBATE_START_DELAY
+        changed.append("debate_started_at")
+    return changed
+
+
+def _set_online(session, now):
+    session.debate_started_at = now
+    changed = ["debate_started_at"]
+    if not session.debate_end_time:
+        session.debate_end_time = now + timedelta(minutes=session.duration_minutes)
+        changed.append("debate_end_time")
+    return changed
+
+
+def _set_voting(session, now):
+    session.debate_end_time = now
+    changed = ["debate_end_time"]
+    if not session.voting_end_time:
+        session.voting_end_time = now + VOTING_WINDOW
+        changed.append("voting_end_time")
+    return changed
+
+
+def _set_ended(session, now):
+    session.voting_end_time = now
+    session.status = "finished"
+    return ["voting_end_time", "status"]
+
+
+# Statuses each lifecycle action may start from, mirroring the model's
+# transition checks so wrong-phase requests are refused before locking
+_TRANSITION_SOURCES = {
+    "start_joining_window": ("offline",),
+    "close_joining_window": ("open",),
+    "start_debate": ("open", "closed"),
+    "end_debate_and_start_voting": ("online",),
+    "finish_voting": ("voting",),
+}
+
+
+def _wrong_phase_response(session, action_name):
+    """Return a 409 response if the session cannot take this transition."""
+    if session.status in _TRANSITION_SOURCES[action_name]:
+        return None
+    transition = action_name.replace("_", " ")
+    return Response(
+        {"error": f"Cannot {transition} from {session.status} status"},
+        status=status.HTTP_409_CONFLICT,
+    )
+
+
+# Timestamp setters for force_phase_transition; each returns the fields it set
+_PHASE_SETTERS = {
+    "open": _set_open,
+    "closed": _set_closed,
+    "online": _set_online,
+    "voting": _set_voting,
+    "ended": _set_ended,
+}
 
 
 class SessionLifecycleMixin:
-    """Mixin containing lifecycle management actions for DebateSessionViewSet"""
+    """
+    Mixin containing lifecycle management actions for DebateSessionViewSet
+
+    Successful actions return their flat status payloads as plain
+    JsonResponses, skipping DRF's content negotiation and renderers.
+    """
+
+    def _announce_transition(self, session, event_type):
+        """Broadcast a lifecycle transition unless the database announces it."""
+        # With DEBATE_SESSION_STATUS_NOTIFY the status trigger notifies the
+        # listen_sessions process, which broadcasts the change itself
+        if not settings.DEBATE_SESSION_STATUS_NOTIFY:
+            run_in_background(self._broadcast_session_update, session, event_type)
 
     @action(detail=True, methods=["post"], permission_classes=[IsSessionModerator])
     def start_joining_window(self, request, pk=None):
         """Start the 5-minute joining window"""
         session = self.get_object()
+        conflict = _wrong_phase_response(session, "start_joining_window")
+        if conflict:
+            return conflict
+
         try:
             session.start_joining_window()
 
             # Send notifications about joining window opening
-            notification_service.send_joining_window_opened(session)
+            run_in_background(notification_service.send_joining_window_opened, session)
 
             # Broadcast session status update
-            self._broadcast_session_update(session, "joining_window_opened")
+            self._announce_transition(session, "joining_window_opened")
 
-            return Response(
+            return JsonResponse(
                 {
                     "status": "joining window started",
                     "session_status": session.status,
@@ -45,13 +149,17 @@ class SessionLifecycleMixin:
     def close_joining_window(self, request, pk=None):
         """Close the joining window and allow only viewers"""
         session = self.get_object()
+        conflict = _wrong_phase_response(session, "close_joining_window")
+        if conflict:
+            return conflict
+
         try:
             session.close_joining_window()
 
             # Broadcast session status update
-            self._broadcast_session_update(session, "joining_window_closed")
+            self._announce_transition(session, "joining_window_closed")
 
-            return Response(
+            return JsonResponse(
                 {"status": "joining window closed", "session_status": session.status}
             )
         except ValidationError as e:
@@ -61,16 +169,20 @@ class SessionLifecycleMixin:
     def start_debate(self, request, pk=None):
         """Start the actual debate (unlock chat for participants)"""
         session = self.get_object()
+        conflict = _wrong_phase_response(session, "start_debate")
+        if conflict:
+            return conflict
+
         try:
             session.start_debate()
 
             # Send notifications about debate starting
-            notification_service.send_debate_started(session)
+            run_in_background(notification_service.send_debate_started, session)
 
             # Broadcast session status update
-            self._broadcast_session_update(session, "debate_started")
+            self._announce_transition(session, "debate_started")
 
-            return Response(
+            return JsonResponse(
                 {
                     "status": "debate started",
                     "session_status": session.status,
@@ -84,16 +196,20 @@ class SessionLifecycleMixin:
     def end_debate_and_start_voting(self, request, pk=None):
         """End debate and start 30-second voting period"""
         session = self.get_object()
+        conflict = _wrong_phase_response(session, "end_debate_and_start_voting")
+        if conflict:
+            return conflict
+
         try:
             session.end_debate_and_start_voting()
 
             # Send voting notifications
-            notification_service.send_voting_started(session)
+            run_in_background(notification_service.send_voting_started, session)
 
             # Broadcast session status update
-            self._broadcast_session_update(session, "voting_started")
+            self._announce_transition(session, "voting_started")
 
-            return Response(
+            return JsonResponse(
                 {
                     "status": "voting started",
                     "session_status": session.status,
@@ -107,16 +223,20 @@ class SessionLifecycleMixin:
     def finish_voting(self, request, pk=None):
         """End voting and calculate results"""
         session = self.get_object()
+        conflict = _wrong_phase_response(session, "finish_voting")
+        if conflict:
+            return conflict
+
         try:
             session.finish_voting()
 
             # Send completion notifications
-            notification_service.send_session_finished(session)
+            run_in_background(notification_service.send_session_finished, session)
 
             # Broadcast session status update
-            self._broadcast_session_update(session, "session_finished")
+            self._announce_transition(session, "session_finished")
 
-            return Response(
+            return JsonResponse(
                 {
                     "status": "voting finished",
                     "session_status": session.status,
@@ -138,10 +258,11 @@ class SessionLifecycleMixin:
         reason = request.data.get("reason", "No reason provided")
 
         session.status = "cancelled"
-        session.save()
+        session.save(update_fields=["status", "updated_at"])
 
         # Send cancellation notifications
-        notification_service.send_session_notification(
+        run_in_background(
+            notification_service.send_session_notification,
             session=session,
             notification_type="session_cancelled",
             title=f"Session cancelled: {session.topic.title}",
@@ -151,9 +272,14 @@ class SessionLifecycleMixin:
         )
 
         # Broadcast session status update
-        self._broadcast_session_update(session, "session_cancelled", {"reason": reason})
+        run_in_background(
+            self._broadcast_session_update,
+            session,
+            "session_cancelled",
+            {"reason": reason},
+        )
 
-        return Response({"status": "session cancelled", "reason": reason})
+        return JsonResponse({"status": "session cancelled", "reason": reason})
 
     @action(detail=True, methods=["post"], permission_classes=[IsSessionModerator])
     def force_phase_transition(self, request, pk=None):
@@ -164,42 +290,26 @@ class SessionLifecycleMixin:
         target_phase = request.data.get("phase")
         reason = request.data.get("reason", "Manual phase transition")
 
-        now = timezone.now()
-
-        if target_phase == "open":
-            session.joining_started_at = now
-            if not session.joining_window_end:
-                session.joining_window_end = now + timedelta(minutes=5)
-        elif target_phase == "closed":
-            session.joining_window_end = now
-            if not session.debate_started_at:
-                session.debate_started_at = now + timedelta(minutes=2)
-        elif target_phase == "online":
-            session.debate_started_at = now
-            if not session.debate_end_time:
-                session.debate_end_time = now + timedelta(
-                    minutes=session.duration_minutes
-                )
-        elif target_phase == "voting":
-            session.debate_end_time = now
-            if not session.voting_end_time:
-                session.voting_end_time = now + timedelta(seconds=30)
-        elif target_phase == "ended":
-            session.voting_end_time = now
-            session.status = "finished"
-
-        session.save()
-
-        # Log the action
-        ModerationAction.objects.create(
-            session=session,
-            moderator=request.user,
-            action="force_phase_transition",
-            target_user=None,
-            reason=f"Phase changed to {target_phase}: {reason}",
-        )
+        # Fields written by the phase's setter; unknown phases change nothing
+        set_phase = _PHASE_SETTERS.get(target_phase)
+        changed = set_phase(session, timezone.now()) if set_phase else []
+
+        # Commit the phase change together with its audit entry
+        with transaction.atomic():
+            # Write only the columns this phase touched
+            if changed:
+                session.save(update_fields=[*changed, "updated_at"])
+
+            # Log the action
+            ModerationAction.objects.create(
+                session=session,
+                moderator=request.user,
+                action="force_phase_transition",
+                target_user=None,
+                reason=f"Phase changed to {target_phase}: {reason}",
+            )
 
-        return Response(
+        return JsonResponse(
             {
                 "status": "success",
                 "message": f"Session phase changed to {target_phase}",
@@ -210,40 +320,38 @@ class SessionLifecycleMixin:
     @action(detail=True, methods=["get"], permission_classes=[])
     def countdown(self, request, pk=None):
         """Get countdown information for phase transitions"""
-        session = self.get_object()
-        now = timezone.now()
-
+        key = countdown_cache_key(pk)
+        countdown_data = cache.get(key)
+        if countdown_data is None:
+            countdown_data = self._compute_countdown(self.get_object())
+            cache.set(key, countdown_data, COUNTDOWN_CACHE_TIMEOUT)
+
+        response = JsonResponse(countdown_data)
+        # The countdown only changes once a second, so let caches share it
+        patch_cache_control(response, max_age=1)
+        return response
+
+    @staticmethod
+    def _compute_countdown(session):
+        """Seconds to the session's next phase, with its label and name."""
         countdown_data = {}
 
-        if session.joining_started_at and now < session.joining_started_at:
-            countdown_data = {
-                "countdown": int((session.joining_started_at - now).total_seconds()),
-                "nextPhaseLabel": "Joining opens",
-                "nextPhase": "open",
-            }
-        elif session.joining_window_end and now < session.joining_window_end:
-            countdown_data = {
-                "countdown": int((session.joining_window_end - now).total_seconds()),
-                "nextPhaseLabel": "Joining closes",
-                "nextPhase": "closed",
-            }
-        elif session.debate_started_at and now < session.debate_started_at:
-            countdown_data = {
-                "countdown": int((session.debate_started_at - now).total_seconds()),
-                "nextPhaseLabel": "Debate starts",
-                "nextPhase": "online",
-            }
-        elif session.debate_end_time and now < session.debate_end_time:
-            countdown_data = {
-                "countdown": int((session.debate_end_time - now).total_seconds()),
-                "nextPhaseLabel": "Voting begins",
-                "nextPhase": "voting",
-            }
-        elif session.voting_end_time and now < session.voting_end_time:
-            countdown_data = {
-                "countdown": int((session.voting_end_time - now).total_seconds()),
-                "nextPhaseLabel": "Session ends",
-                "nextPhase": "ended",
-            }
-
-        return Response(countdown_data)
+        # Finished and cancelled sessions have no upcoming phase
+        if session.status not in ("finished", "cancelled"):
+            now = timezone.now()
+            for phase_at, label, phase in (
+                (session.joining_started_at, "Joining opens", "open"),
+                (session.joining_window_end, "Joining closes", "closed"),
+                (session.debate_started_at, "Debate starts", "online"),
+                (session.debate_end_time, "Voting begins", "voting"),
+                (session.voting_end_time, "Session ends", "ended"),
+            ):
+                if phase_at and now < phase_at:
+                    countdown_data = {
+                        "countdown": int((phase_at - now).total_seconds()),
+                        "nextPhaseLabel": label,
+                        "nextPhase": phase,
+                    }
+                    break
+
+        return countdown_data
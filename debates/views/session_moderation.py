@@ -5,9 +5,12 @@ These actions are separated due to their complexity and specialized nature.
 
 from datetime import timedelta
 
+from channels.layers import get_channel_layer
 from core.permissions import IsSessionModerator
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import F
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from rest_framework import status
@@ -17,267 +20,202 @@ from rest_framework.response import Response
 from ..models import ModerationAction, Participation
 from notifications.models import Notification
 from ..services.notification_service import notification_service
+from ..services.websocket_service import has_live_viewers
+from ..services.ws_batcher import enqueue_broadcast
 
 User = get_user_model()
 
-
-class SessionModerationMixin:
-    """Mixin containing moderation actions for DebateSessionViewSet"""
-
-    @action(detail=True, methods=["post"], permission_classes=[IsSessionModerator])
-    def mute_participant(self, request, pk=None):
-        from asgiref.sync import async_to_sync
-        from channels.layers import get_channel_layer
-
-        session = self.get_object()
-        user_id = request.data.get("user_id")
-        reason = request.data.get("reason", "")
-        user = get_object_or_404(User, id=user_id)
-        participation, created = Participation.objects.get_or_create(
-            user=user, session=session
+# Resolved once per process rather than on every moderation action
+_channel_layer = get_channel_layer()
+
+
+def _get_target_user(user_id):
+    """Load the moderated user, or 404, with only the columns the actions use."""
+    # The id and username are all the payloads need, and related rows only
+    # take the id, so the rest of the user row is left unread
+    return get_object_or_404(User.objects.only("username"), pk=user_id)
+
+
+def _set_muted(user, session, is_muted):
+    """Set the mute flag with one UPDATE, joining the user up if not yet a member."""
+    updated = Participation.objects.filter(user=user, session=session).update(
+        is_muted=is_muted
+    )
+    if not updated:
+        Participation.objects.create(user=user, session=session, is_muted=is_muted)
+
+
+def _load_user(session, user_id):
+    """Target of mute, unmute and warn: any user, who joins up if needed."""
+    return _get_target_user(user_id), None
+
+
+def _load_participant(session, user_id):
+    """Target of remove: an existing participant, with its username in one query."""
+    participation = (
+        Participation.objects.filter(user_id=user_id, session=session)
+        .select_related("user")
+        .only("user__username")
+        .first()
+    )
+    if participation is None:
+        return None, None
+    return participation.user, participation
+
+
+def _apply_mute(session, user, participation):
+    _set_muted(user, session, True)
+
+
+def _apply_unmute(session, user, participation):
+    _set_muted(user, session, False)
+
+
+def _apply_warning(session, user, participation):
+    # Increment in the database so concurrent warnings are not lost
+    participations = Participation.objects.filter(user=user, session=session)
+    if participations.update(warnings_count=F("warnings_count") + 1):
+        return participations.values_list("warnings_count", flat=True).get()
+
+    Participation.objects.create(user=user, session=session, warnings_count=1)
+    return 1
+
+
+def _apply_removal(session, user, participation):
+    participation.delete()
+
+
+# How each moderation action finds its target, changes the participation
+# (returning the new warning count where it has one) and tells the target:
+# "notice" is an in-app (title, message) pair, otherwise the notification
+# service sends its standard moderation message. "delta" holds the fields
+# the action sets on the target's participant entry in clients.
+_MODERATION_ACTIONS = {
+    "mute": {
+        "delta": {"is_muted": True},
+        "load": _load_user,
+        "apply": _apply_mute,
+        "verb": "muted",
+        "notice": None,
+    },
+    "unmute": {
+        "delta": {"is_muted": False},
+        "load": _load_user,
+        "apply": _apply_unmute,
+        "verb": "unmuted",
+        "notice": None,
+    },
+    "warn": {
+        "delta": {},
+        "load": _load_user,
+        "apply": _apply_warning,
+        "verb": "warned",
+        "notice": (
+            "Warning issued",
+            'You have received a warning in the debate "{title}". Reason: {reason}',
+        ),
+    },
+    "remove": {
+        "delta": {},
+        "load": _load_participant,
+        "apply": _apply_removal,
+        "verb": "removed",
+        "notice": (
+            "Removed from debate",
+            'You have been removed from the debate "{title}". Reason: {reason}',
+        ),
+    },
+}
+
+
+def _apply_moderation(action_type, session, request):
+    """Carry out a moderation action on request.data["user_id"] in session."""
+    config = _MODERATION_ACTIONS[action_type]
+    reason = request.data.get("reason", "")
+
+    user, participation = config["load"](session, request.data.get("user_id"))
+    if user is None:
+        return Response(
+            {"error": "User is not a participant in this session"},
+            status=status.HTTP_404_NOT_FOUND,
         )
-        participation.is_muted = True
-        participation.save()
+
+    # Record the change and its audit entry in one transaction
+    with transaction.atomic():
+        warnings_count = config["apply"](session, user, participation)
 
         # Log moderation action
         ModerationAction.objects.create(
             session=session,
             moderator=request.user,
             target_user=user,
-            action="mute",
+            action=action_type,
             reason=reason,
         )
 
+        if config["notice"]:
+            title, message = config["notice"]
+            Notification.objects.create(
+                recipient=user,
+                sender=request.user,
+                notification_type="moderation_action",
+                title=title,
+                message=message.format(title=session.topic.title, reason=reason),
+                session=session,
+            )
+
+    if not config["notice"]:
         # Send moderation notification using service
         notification_service.send_moderation_action(
             session=session,
             target_user=user,
             moderator=request.user,
-            action="mute",
+            action=action_type,
             reason=reason,
         )
 
-        # Broadcast moderation action via WebSocket
-        channel_layer = get_channel_layer()
-        if channel_layer:
-            # Get updated participants list
-            participants = []
-            for participation in session.participation_set.select_related("user").all():
-                participants.append(
-                    {
-                        "id": participation.user.id,
-                        "username": participation.user.username,
-                        "is_muted": participation.is_muted,
-                        "is_online": True,  # You might want to track this properly
-                    }
-                )
-
-            async_to_sync(channel_layer.group_send)(
-                f"debate_{session.id}",
-                {
-                    "type": "moderation_action",
-                    "action": "mute",
-                    "target_user_id": user.id,
-                    "target_username": user.username,
-                    "moderator": request.user.username,
-                    "reason": reason,
-                    "participants": participants,
-                },
-            )
-
-        return Response(
-            {"status": f"user {user.username} muted"}, status=status.HTTP_200_OK
-        )
+    # Broadcast moderation action via WebSocket
+    if _channel_layer and has_live_viewers(session.id):
+        event = {
+            "type": "moderation_action",
+            "action": action_type,
+            "target_user_id": user.id,
+            "target_username": user.username,
+            "moderator": request.user.username,
+            "reason": reason,
+            # Only the target changed, so clients patch their participant
+            # list rather than being sent all of it again
+            **config["delta"],
+        }
+        if warnings_count is not None:
+            event["warnings_count"] = warnings_count
+        enqueue_broadcast(f"debate_{session.id}", event)
+
+    data = {"status": f"user {user.username} {config['verb']}"}
+    if warnings_count is not None:
+        data["warnings"] = warnings_count
+    return Response(data, status=status.HTTP_200_OK)
 
-    @action(detail=True, methods=["post"], permission_classes=[IsSessionModerator])
-    def unmute_participant(self, request, pk=None):
-        from asgiref.sync import async_to_sync
-        from channels.layers import get_channel_layer
-
-        session = self.get_object()
-        user_id = request.data.get("user_id")
-        user = get_object_or_404(User, id=user_id)
-        participation, created = Participation.objects.get_or_create(
-            user=user, session=session
-        )
-        participation.is_muted = False
-        participation.save()
 
-        # Log moderation action
-        ModerationAction.objects.create(
-            session=session, moderator=request.user, target_user=user, action="unmute"
-        )
-
-        # Send moderation notification using service
-        notification_service.send_moderation_action(
-            session=session, target_user=user, moderator=request.user, action="unmute"
-        )
+class SessionModerationMixin:
+    """Mixin containing moderation actions for DebateSessionViewSet"""
 
-        # Broadcast moderation action via WebSocket
-        channel_layer = get_channel_layer()
-        if channel_layer:
-            # Get updated participants list
-            participants = []
-            for participation in session.participation_set.select_related("user").all():
-                participants.append(
-                    {
-                        "id": participation.user.id,
-                        "username": participation.user.username,
-                        "is_muted": participation.is_muted,
-                        "is_online": True,  # You might want to track this properly
-                    }
-                )
-
-            async_to_sync(channel_layer.group_send)(
-                f"debate_{session.id}",
-                {
-                    "type": "moderation_action",
-                    "action": "unmute",
-                    "target_user_id": user.id,
-                    "target_username": user.username,
-                    "moderator": request.user.username,
-                    "participants": participants,
-                },
-            )
+    @action(detail=True, methods=["post"], permission_classes=[IsSessionModerator])
+    def mute_participant(self, request, pk=None):
+        """Mute a participant"""
+        return _apply_moderation("mute", self.get_object(), request)
 
-        return Response(
-            {"status": f"user {user.username} unmuted"}, status=status.HTTP_200_OK
-        )
+    @action(detail=True, methods=["post"], permission_classes=[IsSessionModerator])
+    def unmute_participant(self, request, pk=None):
+        """Unmute a participant"""
+        return _apply_moderation("unmute", self.get_object(), request)
 
     @action(detail=True, methods=["post"], permission_classes=[IsSessionModerator])
     def warn_participant(self, request, pk=None):
         """Warn a participant"""
-        from asgiref.sync import async_to_sync
-        from channels.layers import get_channel_layer
-
-        session = self.get_object()
-        user_id = request.data.get("user_id")
-        reason = request.data.get("reason", "")
-        user = get_object_or_404(User, id=user_id)
-        participation, created = Participation.objects.get_or_create(
-            user=user, session=session
-        )
-        participation.warnings_count += 1
-        participation.save()
-
-        # Log moderation action
-        ModerationAction.objects.create(
-            session=session,
-            moderator=request.user,
-            target_user=user,
-            action="warn",
-            reason=reason,
-        )
-
-        # Create notification
-        Notification.objects.create(
-            recipient=user,
-            sender=request.user,
-            notification_type="moderation_action",
-            title="Warning issued",
-            message=f'You have received a warning in the debate "{session.topic.title}". Reason: {reason}',
-            session=session,
-        )
-
-        # Broadcast moderation action via WebSocket
-        channel_layer = get_channel_layer()
-        if channel_layer:
-            # Get updated participants list
-            participants = []
-            for participation in session.participation_set.select_related("user").all():
-                participants.append(
-                    {
-                        "id": participation.user.id,
-                        "username": participation.user.username,
-                        "is_muted": participation.is_muted,
-                        "warnings_count": participation.warnings_count,
-                        "is_online": True,
-                    }
-                )
-
-            async_to_sync(channel_layer.group_send)(
-                f"debate_{session.id}",
-                {
-                    "type": "moderation_action",
-                    "action": "warn",
-                    "target_user_id": user.id,
-                    "target_username": user.username,
-                    "moderator": request.user.username,
-                    "reason": reason,
-                    "warnings_count": participation.warnings_count,
-                    "participants": participants,
-                },
-            )
-
-        return Response(
-            {
-                "status": f"user {user.username} warned",
-                "warnings": participation.warnings_count,
-            },
-            status=status.HTTP_200_OK,
-        )
+        return _apply_moderation("warn", self.get_object(), request)
 
     @action(detail=True, methods=["post"], permission_classes=[IsSessionModerator])
     def remove_participant(self, request, pk=None):
-        from asgiref.sync import async_to_sync
-        from channels.layers import get_channel_layer
-
-        session = self.get_object()
-        user_id = request.data.get("user_id")
-        reason = request.data.get("reason", "")
-        user = get_object_or_404(User, id=user_id)
-
-        # Log moderation action before removing
-        ModerationAction.objects.create(
-            session=session,
-            moderator=request.user,
-            target_user=user,
-            action="remove",
-            reason=reason,
-        )
-
-        # Create notification
-        Notification.objects.create(
-            recipient=user,
-            sender=request.user,
-            notification_type="moderation_action",
-            title="Removed from debate",
-            message=f'You have been removed from the debate "{session.topic.title}". Reason: {reason}',
-            session=session,
-        )
-
-        # Remove participation
-        Participation.objects.filter(user=user, session=session).delete()
-
-        # Broadcast moderation action via WebSocket
-        channel_layer = get_channel_layer()
-        if channel_layer:
-            # Get updated participants list (after removal)
-            participants = []
-            for participation in session.participation_set.select_related("user").all():
-                participants.append(
-                    {
-                        "id": participation.user.id,
-                        "username": participation.user.username,
-                        "is_muted": participation.is_muted,
-                        "warnings_count": participation.warnings_count,
-                        "is_online": True,
-                    }
-                )
-
-            async_to_sync(channel_layer.group_send)(
-                f"debate_{session.id}",
-                {
-                    "type": "moderation_action",
-                    "action": "remove",
-                    "target_user_id": user.id,
-                    "target_username": user.username,
-                    "moderator": request.user.username,
-                    "reason": reason,
-                    "participants": participants,
-                },
-            )
-
-        return Response(
-            {"status": f"user {user.username} removed"}, status=status.HTTP_200_OK
-        )
+        """Remove a participant from the session"""
+        return _apply_moderation("remove", self.get_object(), request)
@@ -9,12 +9,16 @@ This module provides comprehensive session management including:
 - Voting functionality
 """
 
+import json
 from datetime import timedelta
 
 from core.permissions import IsModerator, IsSessionModerator
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
-from django.db.models import Count
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, Max, Prefetch, Q
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from rest_framework import status, viewsets
@@ -30,13 +34,56 @@ from ..models import (
     Participation,
 )
 from notifications.models import Notification
-from ..serializers import DebateSessionSerializer
+from ..serializers import DebateSessionListSerializer, DebateSessionSerializer
+from ..services.background import run_in_background
 from ..services.notification_service import notification_service
+from ..services.optimized_views import invalidate_session_list_cache
+from ..services.session_status import get_session_status, status_cache_key
+from ..services.websocket_service import broadcast_session_status
 from .session_lifecycle import SessionLifecycleMixin
 from .session_moderation import SessionModerationMixin
 
 User = get_user_model()
 
+# Lifecycle, moderation, participant and transcript actions work on the
+# session row itself, and only read its topic's title and moderator's name
+SESSION_ACTIONS = {
+    "start_joining_window",
+    "close_joining_window",
+    "start_debate",
+    "end_debate_and_start_voting",
+    "finish_voting",
+    "cancel_session",
+    "force_phase_transition",
+    "countdown",
+    "mute_participant",
+    "unmute_participant",
+    "warn_participant",
+    "remove_participant",
+    "transcript",
+    "participants",
+}
+SESSION_ACTION_FIELDS = (
+    "status",
+    "moderator__username",
+    "topic__title",
+    "duration_minutes",
+    "joining_started_at",
+    "joining_window_end",
+    "debate_started_at",
+    "debate_end_time",
+    "voting_started_at",
+    "voting_end_time",
+    "winner_participant",
+    "total_votes",
+)
+
+# Participants allowed on each side of a session
+MAX_PARTICIPANTS_PER_SIDE = 10
+
+# Messages fetched per database round trip while streaming a transcript
+TRANSCRIPT_CHUNK_SIZE = 500
+
 
 class DebateSessionViewSet(
     SessionModerationMixin, SessionLifecycleMixin, viewsets.ModelViewSet
@@ -60,6 +107,48 @@ class DebateSessionViewSet(
     queryset = DebateSession.objects.all()
     serializer_class = DebateSessionSerializer
 
+    def get_queryset(self):
+        """
+        Return sessions with the relations used by DebateSessionSerializer loaded.
+
+        Participations are prefetched with their users, and additionally split
+        by role in SQL, so the serializer's participant and viewer fields are
+        built without per-session queries. The actions in SESSION_ACTIONS
+        skip all of that and load only the session columns they use.
+        """
+        if self.action in SESSION_ACTIONS:
+            return DebateSession.objects.select_related("topic", "moderator").only(
+                *SESSION_ACTION_FIELDS
+            )
+
+        participations = Participation.objects.select_related("user")
+        queryset = DebateSession.objects.select_related(
+            "topic", "moderator", "winner_participant"
+        ).prefetch_related(
+            Prefetch(
+                "participation_set",
+                queryset=participations.filter(role="participant"),
+                to_attr="active_participations",
+            ),
+            Prefetch(
+                "participation_set",
+                queryset=participations.filter(role="viewer"),
+                to_attr="viewer_participations",
+            ),
+        )
+        if self.action == "list":
+            # The list serializer does not nest the full participation set
+            return queryset
+        return queryset.prefetch_related(
+            Prefetch("participation_set", queryset=participations)
+        )
+
+    def get_serializer_class(self):
+        """Use the slim serializer for session lists."""
+        if self.action == "list":
+            return DebateSessionListSerializer
+        return super().get_serializer_class()
+
     def get_permissions(self):
         """
         Determine permissions based on action type.
@@ -105,7 +194,7 @@ class DebateSessionViewSet(
             pk: Primary key of the debate session.
 
         Returns:
-            Response: JSON response containing participant data organized by role.
+            JsonResponse: Participant data organized by role.
         """
         session = self.get_object()
 
@@ -123,30 +212,42 @@ class DebateSessionViewSet(
                 "role": "moderator",
             }
 
-        # Process all participations
-        participations = session.participation_set.select_related("user").all()
+        # Process all participations as plain rows; the username comes from
+        # the JOIN and no Participation or User instances are built
+        participations = session.participation_set.filter(
+            role__in=("participant", "viewer")
+        ).values(
+            "user_id",
+            "user__username",
+            "role",
+            "side",
+            "is_muted",
+            "warnings_count",
+            "joined_at",
+        )
         for participation in participations:
             user_data = {
-                "id": participation.user.id,
-                "username": participation.user.username,
-                "role": participation.role,
-                "side": participation.side,
-                "is_muted": participation.is_muted,
-                "warnings_count": participation.warnings_count,
-                "joined_at": participation.joined_at.isoformat(),
+                "id": participation["user_id"],
+                "username": participation["user__username"],
+                "role": participation["role"],
+                "side": participation["side"],
+                "is_muted": participation["is_muted"],
+                "warnings_count": participation["warnings_count"],
+                "joined_at": participation["joined_at"].isoformat(),
                 "is_online": True,  # TODO: Check WebSocket cache for real status
             }
 
             # Categorize participants by role and side
-            if participation.role == "participant":
-                if participation.side == "proposition":
+            if participation["role"] == "participant":
+                if participation["side"] == "proposition":
                     proposition_participants.append(user_data)
-                elif participation.side == "opposition":
+                elif participation["side"] == "opposition":
                     opposition_participants.append(user_data)
-            elif participation.role == "viewer":
+            elif participation["role"] == "viewer":
                 viewers.append(user_data)
 
-        return Response(
+        # Plain rows need no serializer, so skip DRF's negotiation and renderer
+        return JsonResponse(
             {
                 "moderator": moderator_info,
                 "debaters": {
@@ -167,6 +268,17 @@ class DebateSessionViewSet(
             }
         )
 
+    @staticmethod
+    def _side_full_response(session, side):
+        """Reject a participant join because their chosen side is full."""
+        return Response(
+            {
+                "error": f"Maximum participants reached for {side} side",
+                "can_join_as_viewer": session.can_join_as_viewer,
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
     @action(detail=True, methods=["post"], permission_classes=[IsAuthenticated])
     def join(self, request, pk=None):
         """
@@ -210,18 +322,16 @@ class DebateSessionViewSet(
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            # Check side balance (max 10 per side)
-            side_count = session.participation_set.filter(
-                role="participant", side=side
-            ).count()
-            if side_count >= 10:
-                return Response(
-                    {
-                        "error": f"Maximum participants reached for {side} side",
-                        "can_join_as_viewer": session.can_join_as_viewer,
-                    },
-                    status=status.HTTP_400_BAD_REQUEST,
+            # Check side balance (max 10 per side). On PostgreSQL a trigger
+            # (migration 0023) enforces it atomically with the insert below.
+            if connection.vendor != "postgresql":
+                side_count = (
+                    session.participation_set.filter(role="participant", side=side)
+                    .exclude(user=request.user)
+                    .count()
                 )
+                if side_count >= MAX_PARTICIPANTS_PER_SIDE:
+                    return self._side_full_response(session, side)
 
         elif role == "viewer":
             if not session.can_join_as_viewer:
@@ -231,19 +341,30 @@ class DebateSessionViewSet(
                 )
             side = None  # Viewers don't have sides
 
-        # Create or update participation
-        participation, created = Participation.objects.get_or_create(
-            user=request.user, session=session, defaults={"role": role, "side": side}
-        )
-
-        if not created:
-            # Update existing participation
-            participation.role = role
-            if role == "participant":
-                participation.side = side
-            else:
-                participation.side = None
-            participation.save()
+        # Create or update the participation in one upsert
+        # (INSERT ... ON CONFLICT (user_id, session_id) DO UPDATE)
+        try:
+            with transaction.atomic():
+                Participation.objects.bulk_create(
+                    [
+                        Participation(
+                            user=request.user,
+                            session=session,
+                            role=role,
+                            side=side if role == "participant" else None,
+                        )
+                    ],
+                    update_conflicts=True,
+                    unique_fields=["user", "session"],
+                    update_fields=["role", "side", "updated_at", "last_activity"],
+                )
+        except IntegrityError:
+            # Raised by the side limit trigger when the side filled up
+            return self._side_full_response(session, side)
+        # bulk_create skips post_save, so do what the signal handlers would
+        DebateSession.recount_participants(session.id)
+        invalidate_session_list_cache()
+        cache.delete(status_cache_key(session.id))
 
         # Send notification to moderator for new participants
         if (
@@ -252,7 +373,9 @@ class DebateSessionViewSet(
             and session.moderator != request.user
         ):
             side_text = f" ({side})" if side else ""
-            notification_service.send_notification(
+            # Notify off the request path so a join stampede isn't held up
+            run_in_background(
+                notification_service.send_notification,
                 recipients=[session.moderator],
                 notification_type="session_invite",
                 title=f"New participant: {request.user.username}",
@@ -312,68 +435,21 @@ class DebateSessionViewSet(
         """
         Broadcast session updates via WebSocket to all connected clients.
 
-        Sends real-time updates about session status changes to all participants
-        and viewers connected to the session's WebSocket group.
-
         Args:
             session: The DebateSession instance being updated.
             event_type: Type of event being broadcasted.
             extra_data: Optional additional data to include in broadcast.
         """
-        from asgiref.sync import async_to_sync
-        from channels.layers import get_channel_layer
-
-        channel_layer = get_channel_layer()
-        if not channel_layer:
-            return
-
-        # Prepare base message data
-        data = {
-            "type": "session_status_update",
-            "event_type": event_type,
-            "session_status": session.status,
-            "timestamp": timezone.now().isoformat(),
-        }
-
-        # Add any extra data provided
-        if extra_data:
-            data.update(extra_data)
-
-        # Add status-specific timing information
-        if session.status == "open":
-            data["joining_window_end"] = (
-                session.joining_window_end.isoformat()
-                if session.joining_window_end
-                else None
-            )
-        elif session.status == "online":
-            data["debate_end_time"] = (
-                session.debate_end_time.isoformat() if session.debate_end_time else None
-            )
-        elif session.status == "voting":
-            data["voting_end_time"] = (
-                session.voting_end_time.isoformat() if session.voting_end_time else None
-            )
-        elif session.status == "finished":
-            data.update(
-                {
-                    "winner": (
-                        session.winner_participant.username
-                        if session.winner_participant
-                        else None
-                    ),
-                    "total_votes": session.total_votes,
-                }
-            )
-
-        # Broadcast to session group
-        async_to_sync(channel_layer.group_send)(f"debate_{session.id}", data)
+        broadcast_session_status(session, event_type, extra_data)
 
     @action(detail=True, methods=["get"], permission_classes=[])
     def status(self, request, pk=None):
         """
         Get enhanced session status with phase-aware information.
 
+        Deprecated for polling: clients receive this payload over the debate
+        WebSocket on connect and with every phase change.
+
         Provides comprehensive session status including:
         - Current phase determination
         - Countdown timers to next phase
@@ -387,73 +463,7 @@ class DebateSessionViewSet(
         Returns:
             Response: Comprehensive session status information.
         """
-        session = self.get_object()
-        now = timezone.now()
-
-        # Determine current phase based on timestamps
-        if session.status == "cancelled":
-            phase = "ended"
-        elif not session.joining_started_at or now < session.joining_started_at:
-            phase = "offline"
-        elif now < session.joining_window_end:
-            phase = "open"
-        elif now < session.debate_started_at:
-            phase = "closed"
-        elif now < session.debate_end_time:
-            phase = "online"
-        elif session.voting_end_time and now < session.voting_end_time:
-            phase = "voting"
-        else:
-            phase = "ended"
-
-        # Calculate countdown to next phase
-        countdown = None
-        next_phase_label = None
-
-        if phase == "offline" and session.joining_started_at:
-            countdown = int((session.joining_started_at - now).total_seconds())
-            next_phase_label = "Joining opens"
-        elif phase == "open":
-            countdown = int((session.joining_window_end - now).total_seconds())
-            next_phase_label = "Joining closes"
-        elif phase == "closed":
-            countdown = int((session.debate_started_at - now).total_seconds())
-            next_phase_label = "Debate starts"
-        elif phase == "online":
-            countdown = int((session.debate_end_time - now).total_seconds())
-            next_phase_label = "Voting begins"
-        elif phase == "voting" and session.voting_end_time:
-            countdown = int((session.voting_end_time - now).total_seconds())
-            next_phase_label = "Session ends"
-
-        # Gather real-time statistics
-        participant_count = session.participation_set.filter(role="participant").count()
-        viewer_count = session.participation_set.filter(role="viewer").count()
-        message_count = session.messages.count()
-
-        return Response(
-            {
-                "phase": phase,
-                "canJoin": phase == "open",
-                "canChat": phase == "online",
-                "canVote": phase == "voting",
-                "countdownToNextPhase": countdown,
-                "nextPhaseLabel": next_phase_label,
-                "participantCount": participant_count,
-                "viewerCount": viewer_count,
-                "messageCount": message_count,
-                "sessionInfo": {
-                    "id": session.id,
-                    "title": session.topic.title,
-                    "description": session.topic.description,
-                    "moderator": (
-                        session.moderator.username if session.moderator else None
-                    ),
-                    "duration_minutes": session.duration_minutes,
-                    "created_at": session.created_at.isoformat(),
-                },
-            }
-        )
+        return Response(get_session_status(pk, self.get_object))
 
     # @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
     # def vote(self, request, pk=None):
@@ -475,6 +485,9 @@ class DebateSessionViewSet(
         """
         Check if user has voted in this session.
 
+        Deprecated for polling: the voter's notification WebSocket receives a
+        user_vote message when their vote is recorded.
+
         Args:
             request: The HTTP request object.
             pk: Primary key of the debate session.
@@ -483,14 +496,16 @@ class DebateSessionViewSet(
             Response: User's voting status and choice if applicable.
         """
         session = self.get_object()
-        user_vote = DebateVote.objects.filter(
-            session=session, voter=request.user
-        ).first()
+        user_vote = (
+            DebateVote.objects.filter(debate_session=session, user=request.user)
+            .values_list("vote_type", flat=True)
+            .first()
+        )
 
         return Response(
             {
                 "has_voted": user_vote is not None,
-                "vote": user_vote.vote if user_vote else None,
+                "vote": user_vote,
             }
         )
 
@@ -514,18 +529,21 @@ class DebateSessionViewSet(
         """
         session = self.get_object()
 
-        # Get vote counts by side
-        votes = DebateVote.objects.filter(session=session)
-        proposition_votes = votes.filter(vote="proposition").count()
-        opposition_votes = votes.filter(vote="opposition").count()
-        total_votes = proposition_votes + opposition_votes
-
-        # Check current user's voting status
-        user_vote = None
-        user_vote_obj = None
+        # Get vote counts by side and the current user's vote in one query
+        tallies = {
+            "proposition": Count("pk", filter=Q(vote_type="proposition")),
+            "opposition": Count("pk", filter=Q(vote_type="opposition")),
+        }
         if request.user.is_authenticated:
-            user_vote_obj = votes.filter(voter=request.user).first()
-            user_vote = user_vote_obj.vote if user_vote_obj else None
+            # A user votes at most once, so Max() is just their vote, if any
+            tallies["user_vote"] = Max("vote_type", filter=Q(user=request.user))
+        vote_counts = DebateVote.objects.filter(debate_session=session).aggregate(
+            **tallies
+        )
+        proposition_votes = vote_counts["proposition"]
+        opposition_votes = vote_counts["opposition"]
+        total_votes = proposition_votes + opposition_votes
+        user_vote = vote_counts.get("user_vote")
 
         # Determine winner
         if proposition_votes > opposition_votes:
@@ -535,18 +553,13 @@ class DebateSessionViewSet(
         else:
             winner = "tie"
 
-        # Get participant information by side
-        proposition_participants = (
-            session.participation_set.filter(role="participant", side="proposition")
-            .select_related("user")
-            .values("user__username", "user__id")
-        )
-
-        opposition_participants = (
-            session.participation_set.filter(role="participant", side="opposition")
-            .select_related("user")
-            .values("user__username", "user__id")
-        )
+        # Get participant information by side, splitting one query's rows
+        participants_by_side = {"proposition": [], "opposition": []}
+        for participant in session.participation_set.filter(
+            role="participant", side__in=participants_by_side
+        ).values("side", "user__username", "user__id"):
+            side = participant.pop("side")
+            participants_by_side[side].append(participant)
 
         return Response(
             {
@@ -556,10 +569,7 @@ class DebateSessionViewSet(
                 "hasVoted": user_vote is not None,
                 "userVote": user_vote,
                 "winner": winner,
-                "participants": {
-                    "proposition": list(proposition_participants),
-                    "opposition": list(opposition_participants),
-                },
+                "participants": participants_by_side,
                 "voting_end_time": (
                     session.voting_end_time.isoformat()
                     if session.voting_end_time
@@ -581,38 +591,56 @@ class DebateSessionViewSet(
             pk: Primary key of the debate session.
 
         Returns:
-            Response: Complete session transcript with metadata.
+            StreamingHttpResponse: Complete session transcript with metadata.
         """
         session = self.get_object()
 
-        # Get messages for transcript (ordered by timestamp)
+        # Messages in timestamp order, read in chunks as plain rows with only
+        # the columns the transcript shows
         messages = (
             Message.objects.filter(session=session)
-            .select_related("user")
             .order_by("timestamp")
-        )
-
-        transcript_data = []
-        for message in messages:
-            transcript_data.append(
-                {
-                    "id": message.id,
-                    "timestamp": message.timestamp.isoformat(),
-                    "user": {"id": message.user.id, "username": message.user.username},
-                    "content": message.content,
-                    "message_type": getattr(message, "message_type", "text"),
-                }
+            .values(
+                "id",
+                "timestamp",
+                "content",
+                "message_type",
+                "user_id",
+                "user__username",
             )
+            .iterator(chunk_size=TRANSCRIPT_CHUNK_SIZE)
+        )
 
-        return Response(
+        header = json.dumps(
             {
                 "session_id": session.id,
                 "topic": session.topic.title,
-                "transcript": transcript_data,
                 "generated_at": timezone.now().isoformat(),
             }
         )
 
+        def stream():
+            # The header object, reopened to append the transcript array
+            yield f'{header[:-1]}, "transcript": ['
+            separator = ""
+            for message in messages:
+                entry = {
+                    "id": message["id"],
+                    "timestamp": message["timestamp"].isoformat(),
+                    "user": {
+                        "id": message["user_id"],
+                        "username": message["user__username"],
+                    },
+                    "content": message["content"],
+                    "message_type": message["message_type"],
+                }
+                yield separator + json.dumps(entry)
+                separator = ","
+            yield "]}"
+
+        # Stream the array so long transcripts are never held in memory whole
+        return StreamingHttpResponse(stream(), content_type="application/json")
+
     @action(detail=True, methods=["get"], permission_classes=[IsAuthenticated])
     def analytics(self, request, pk=None):
         """
@@ -633,32 +661,32 @@ class DebateSessionViewSet(
         """
         session = self.get_object()
 
-        # Message analytics
-        messages = session.messages.all()
+        # Message analytics, off the session's running message count
         message_stats = {
-            "total": messages.count(),
+            "total": session.message_count,
             "by_hour": {},  # TODO: Implement hourly message distribution
             "top_participants": [],  # TODO: Implement top participants by message count
         }
 
-        # Participation analytics
-        participations = session.participation_set.all()
+        # Participation analytics: role counts are kept on the session row,
+        # moderation counts come from one query
         participant_stats = {
-            "total_participants": participations.filter(role="participant").count(),
-            "total_viewers": participations.filter(role="viewer").count(),
-            "muted_count": participations.filter(is_muted=True).count(),
-            "warned_count": participations.filter(warnings_count__gt=0).count(),
+            "total_participants": session.participant_count,
+            "total_viewers": session.viewer_count,
+            **session.participation_set.aggregate(
+                muted_count=Count("pk", filter=Q(is_muted=True)),
+                warned_count=Count("pk", filter=Q(warnings_count__gt=0)),
+            ),
         }
 
-        # Voting analytics
-        votes = session.votes.all()
+        # Voting analytics, likewise in one query
         total_voters = participant_stats["total_viewers"]  # Only viewers can vote
-        vote_stats = {
-            "total_votes": votes.count(),
-            "pro_votes": votes.filter(vote="proposition").count(),
-            "con_votes": votes.filter(vote="opposition").count(),
-            "participation_rate": 0,
-        }
+        vote_stats = session.votes.aggregate(
+            total_votes=Count("pk"),
+            pro_votes=Count("pk", filter=Q(vote_type="proposition")),
+            con_votes=Count("pk", filter=Q(vote_type="opposition")),
+        )
+        vote_stats["participation_rate"] = 0
 
         # Calculate voting participation rate
         if total_voters > 0:
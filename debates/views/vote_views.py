@@ -7,7 +7,9 @@ Provides voting functionality as per requirements:
 """
 
 import logging
-from django.db import transaction
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Q
 from django.shortcuts import get_object_or_404
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
@@ -20,6 +22,14 @@ from ..serializers import VoteSerializer
 logger = logging.getLogger(__name__)
 
 
+def _already_voted_response():
+    """Response for a second ballot from the same user in a session."""
+    return Response(
+        {"error": "You have already voted in this session"},
+        status=status.HTTP_400_BAD_REQUEST,
+    )
+
+
 class DebateVoteViewSet(viewsets.ModelViewSet):
     """
     ViewSet for managing debate votes.
@@ -39,6 +49,19 @@ class DebateVoteViewSet(viewsets.ModelViewSet):
             return Vote.objects.filter(user=self.request.user)
         return Vote.objects.none()
 
+    def perform_create(self, serializer):
+        vote = serializer.save()
+        DebateSession.recount_votes(vote.debate_session_id)
+
+    def perform_update(self, serializer):
+        vote = serializer.save()
+        DebateSession.recount_votes(vote.debate_session_id)
+
+    def perform_destroy(self, instance):
+        session_id = instance.debate_session_id
+        instance.delete()
+        DebateSession.recount_votes(session_id)
+
 
 class VoteSubmissionViewSet(viewsets.ViewSet):
     """
@@ -82,17 +105,6 @@ class VoteSubmissionViewSet(viewsets.ViewSet):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            # Check if user already voted
-            existing_vote = Vote.objects.filter(
-                debate_session=session, user=request.user
-            ).first()
-
-            if existing_vote:
-                return Response(
-                    {"error": "You have already voted in this session"},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-
             # Validate vote_type
             vote_type = request.data.get("vote_type")
             if vote_type not in ["BEST_ARGUMENT", "WINNING_SIDE"]:
@@ -103,21 +115,50 @@ class VoteSubmissionViewSet(viewsets.ViewSet):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            # Create the vote
-            with transaction.atomic():
-                vote = Vote.objects.create(
-                    debate_session=session, user=request.user, vote_type=vote_type
-                )
+            # During the voting window, queue the ballot for a batched insert
+            if settings.VOTE_BUFFER_ENABLED and session.status == "voting":
+                from ..services.vote_buffer import buffer_vote
+                from ..services.websocket_service import broadcast_user_vote
+
+                # Buffered ballots only reach the unique constraint at flush
+                # time: a stored vote is looked up here, and buffer_vote's
+                # voter claim rejects one still waiting in the buffer
+                if Vote.objects.filter(
+                    debate_session=session, user=request.user
+                ).exists():
+                    return _already_voted_response()
 
-                # Broadcast voting update via WebSocket
                 try:
-                    from ..services.websocket_service import broadcast_vote_update
+                    buffer_vote(session.id, request.user.id, vote_type)
+                except IntegrityError:
+                    return _already_voted_response()
+                broadcast_user_vote(request.user.id, session.id, vote_type)
+                return Response(
+                    {"message": "Vote accepted"}, status=status.HTTP_202_ACCEPTED
+                )
 
-                    broadcast_vote_update(session, vote)
-                except ImportError:
-                    logger.warning(
-                        "WebSocket service not available for vote broadcasting"
+            # Create the vote; the (debate_session, user) unique constraint
+            # rejects a second ballot without a prior SELECT
+            try:
+                with transaction.atomic():
+                    vote = Vote.objects.create(
+                        debate_session=session, user=request.user, vote_type=vote_type
                     )
+                    session.record_vote(vote_type)
+            except IntegrityError:
+                return _already_voted_response()
+
+            # Broadcast voting update via WebSocket
+            try:
+                from ..services.websocket_service import (
+                    broadcast_user_vote,
+                    broadcast_vote_update,
+                )
+
+                broadcast_vote_update(session, vote)
+                broadcast_user_vote(request.user.id, session.id, vote_type)
+            except ImportError:
+                logger.warning("WebSocket service not available for vote broadcasting")
 
             return Response(
                 {
@@ -153,22 +194,20 @@ class VoteSubmissionViewSet(viewsets.ViewSet):
             # Get the debate session
             session = get_object_or_404(DebateSession, id=pk)
 
-            # Get vote statistics
-            votes = Vote.objects.filter(debate_session=session)
-
-            best_argument_votes = votes.filter(vote_type="BEST_ARGUMENT").count()
-            winning_side_votes = votes.filter(vote_type="WINNING_SIDE").count()
-            total_votes = votes.count()
-
-            # Check if current user has voted
-            user_voted = votes.filter(user=request.user).exists()
+            # Get vote statistics and the user's own ballot in one query
+            stats = Vote.objects.filter(debate_session=session).aggregate(
+                best_argument_votes=Count("pk", filter=Q(vote_type="BEST_ARGUMENT")),
+                winning_side_votes=Count("pk", filter=Q(vote_type="WINNING_SIDE")),
+                total_votes=Count("pk"),
+                user_votes=Count("pk", filter=Q(user=request.user)),
+            )
 
             return Response(
                 {
-                    "best_argument_votes": best_argument_votes,
-                    "winning_side_votes": winning_side_votes,
-                    "total_votes": total_votes,
-                    "user_voted": user_voted,
+                    "best_argument_votes": stats["best_argument_votes"],
+                    "winning_side_votes": stats["winning_side_votes"],
+                    "total_votes": stats["total_votes"],
+                    "user_voted": stats["user_votes"] > 0,
                 }
             )
 
@@ -84,6 +84,12 @@ class Notification(models.Model):
             models.Index(fields=["user", "-created_at"]),
             models.Index(fields=["user", "is_read"]),
             models.Index(fields=["type"]),
+            # Unread badge counts only ever look at unread rows
+            models.Index(
+                fields=["user"],
+                name="idx_notification_unread",
+                condition=models.Q(is_read=False),
+            ),
         ]
 
     def __str__(self):
@@ -139,6 +139,14 @@ else:
             "PASSWORD": os.getenv("DB_PASSWORD", "password"),
             "HOST": os.getenv("DB_HOST", "localhost"),
             "PORT": os.getenv("DB_PORT", "5432"),
+            # Reuse connections across requests instead of reconnecting each time
+            "CONN_MAX_AGE": int(os.getenv("DJANGO_CONN_MAX_AGE", 60)),
+            "CONN_HEALTH_CHECKS": True,
+            # Required when connecting through PgBouncer in transaction mode
+            "DISABLE_SERVER_SIDE_CURSORS": os.getenv(
+                "DB_DISABLE_SERVER_SIDE_CURSORS", "False"
+            ).lower()
+            == "true",
             "OPTIONS": {
                 "connect_timeout": 20,
             },
@@ -148,6 +156,27 @@ else:
 # Redis Configuration
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 
+# Buffer votes in Redis during the voting window and insert them in batches
+VOTE_BUFFER_ENABLED = os.getenv("VOTE_BUFFER_ENABLED", "False").lower() == "true"
+
+# Seconds between flushes by the flush_votes command. A buffered vote reaches
+# the database within one interval plus the time the flush itself takes;
+# finish_voting flushes the remainder when the window closes.
+VOTE_BUFFER_FLUSH_INTERVAL = float(os.getenv("VOTE_BUFFER_FLUSH_INTERVAL", 0.5))
+
+# Rows per INSERT for bulk_create batch operations
+DEBATE_BULK_BATCH_SIZE = int(os.getenv("DEBATE_BULK_BATCH_SIZE", 1000))
+
+# Run lifecycle notifications and broadcasts inline instead of in the background
+DEBATE_BACKGROUND_TASKS_EAGER = (
+    os.getenv("DEBATE_BACKGROUND_TASKS_EAGER", "False").lower() == "true"
+)
+
+# Leave session status broadcasts to the PostgreSQL trigger and listen_sessions
+DEBATE_SESSION_STATUS_NOTIFY = (
+    os.getenv("DEBATE_SESSION_STATUS_NOTIFY", "False").lower() == "true"
+)
+
 # Caching Configuration for Performance Optimization
 # Use Redis for production, LocMem for development
 try:
@@ -46,7 +46,9 @@ CHANNEL_LAYERS = {
 }
 
 
-# Disable migrations for faster tests
+# Disable migrations for faster tests: the test database schema is created
+# directly from the current models in one pass instead of replaying every
+# migration (some of which are PostgreSQL-only)
 class DisableMigrations:
     def __contains__(self, item):
         return True
@@ -55,13 +57,21 @@ class DisableMigrations:
         return None
 
 
-# MIGRATION_MODULES = DisableMigrations()
+MIGRATION_MODULES = DisableMigrations()
 
 # Test-specific settings
 PASSWORD_HASHERS = [
     "django.contrib.auth.hashers.MD5PasswordHasher",  # Fast for tests
 ]
 
+# Sign test JWTs with HMAC and a fixed key, whatever the main settings use
+SIMPLE_JWT = {
+    **SIMPLE_JWT,
+    "ALGORITHM": "HS256",
+    "SIGNING_KEY": "test-only-jwt-signing-key-not-for-production",
+    "VERIFYING_KEY": None,
+}
+
 # Disable logging during tests
 LOGGING = {
     "version": 1,
@@ -79,3 +89,6 @@ LOGGING = {
 # Disable celery for tests
 CELERY_TASK_ALWAYS_EAGER = True
 CELERY_TASK_EAGER_PROPAGATES = True
+
+# Run lifecycle side effects inline so tests can observe them
+DEBATE_BACKGROUND_TASKS_EAGER = True